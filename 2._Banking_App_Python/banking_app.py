@@ -2,6 +2,17 @@ import csv
 import os
 from datetime import datetime
 
+from concurrency import ConflictError, FileLock, bump_version, read_version
+from dedup import DuplicateIndex
+from events import ChangeFeed
+from hashchain import HashChain
+from idempotency import IdempotencyStore, file_digest
+from query import top_accounts
+from scheduler import ORDERS_FILE, run_due_orders
+from serializers import configured_serializer, get_serializer, table_path
+from snapshot import Snapshot
+from velocity import VelocityLimiter
+
 # --------------------------------------------
 # Utility Functions
 # --------------------------------------------
@@ -9,14 +20,6 @@ def clear():
     os.system('cls' if os.name == 'nt' else 'clear')
 
 
-def create_file_if_missing(filename, fieldnames):
-    """Creates CSV file with headers if not exists."""
-    if not os.path.exists(filename):
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-
-
 def read_csv(filename):
     data = []
     if os.path.exists(filename):
@@ -26,6 +29,12 @@ def read_csv(filename):
     return data
 
 
+def next_id(rows, key, prefix, width):
+    """Next ID after the highest existing one; counting rows would collide after deletes."""
+    highest = max((int(r[key][len(prefix):]) for r in rows if r[key][len(prefix):].isdigit()), default=0)
+    return prefix + str(highest + 1).zfill(width)
+
+
 def write_csv(filename, fieldnames, data):
     with open(filename, 'w', newline='', encoding='utf-8') as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
@@ -65,10 +74,13 @@ class SavingsAccount(BankAccount):
         super().__init__(acc_no, cust_id, balance)
         self.interest_rate = interest_rate
 
-    def add_interest(self):
-        interest = self.balance * self.interest_rate
+    def add_interest(self, interest):
+        """Credits an accrued amount; interest.py computes it from the average daily balance."""
+        if interest is None or interest <= 0:
+            raise ValueError("Interest amount must be positive.")
         self.balance += interest
         print(f"Interest {interest:.2f} added. New balance: {self.balance:.2f}")
+        return interest
 
 
 # --------------------------------------------
@@ -88,51 +100,201 @@ class Customer:
 # --------------------------------------------
 # Banking System Controller
 # --------------------------------------------
+# Attempts at a posting whose account keeps being changed by other tellers
+MAX_RETRIES = 5
+
+
 class BankingSystem:
-    def __init__(self):
+    def __init__(self, storage_format=None):
+
+        # Storage format: csv (default) or jsonl/binary/columnar/parquet, see serializers.py.
+        # reconcile, statements, replica, dedup and hashchain follow BANKING_FORMAT too.
+        self.serializer = get_serializer(storage_format) if storage_format else configured_serializer()
 
-        # CSV file locations
+        # Data file locations
         base = os.path.dirname(os.path.abspath(__file__))
-        self.customers_file = os.path.join(base, "customers.csv")
-        self.accounts_file = os.path.join(base, "accounts.csv")
-        self.transactions_file = os.path.join(base, "transactions.csv")
+        self.customers_file = table_path(base, "customers", self.serializer)
+        self.accounts_file = table_path(base, "accounts", self.serializer)
+        self.transactions_file = table_path(base, "transactions", self.serializer)
+        self.idempotency_file = os.path.join(base, "idempotency_keys.db")
+        self.events_file = os.path.join(base, "events.log")
+
+        self.tables = {
+            "customers": (self.customers_file, ["CustomerID", "Name", "Email", "Phone"]),
+            "accounts": (self.accounts_file, ["AccountNo", "CustomerID", "Balance"]),
+            "transactions": (self.transactions_file, ["Timestamp", "AccountNo", "Action", "Amount"]),
+        }
+
+        # Auto-create data files if missing. When BANKING_FORMAT is switched
+        # away from csv, existing CSV data is converted once (the CSV files
+        # are left in place) instead of starting from empty tables.
+        for filename, fieldnames in self.tables.values():
+            source = os.path.splitext(filename)[0] + ".csv"
+            if filename != source and os.path.exists(source):
+                with FileLock(filename):
+                    if not os.path.exists(filename):
+                        self.serializer.save(filename, fieldnames, get_serializer("csv").load(source))
+                        print(f"Converted {os.path.basename(source)} to {self.serializer.name} format.")
+            self.serializer.create_if_missing(filename, fieldnames)
+
+        # Withdrawal velocity limits (rebuilt from history whenever the ledger is reloaded)
+        self.velocity = VelocityLimiter()
+        # Duplicate-customer index: built on first use, kept up to date by our own
+        # adds and removes, dropped whenever customers are reloaded from disk
+        self.dup_index = None
+
+        # Load data (version stamps detect writes by other teller processes)
+        self.versions = {}
+        self.shared = set()  # tables referenced by an outstanding snapshot
+        for name in self.tables:
+            self._reload(name)
+
+        # Tamper-evident hash chain over the transaction history
+        # Only rows this app writes are chained; anything else is reported
+        self.chain = HashChain(self.transactions_file, self.serializer)
+        self.chain_problems = []
+        with FileLock(self.transactions_file):
+            self.refresh("transactions")
+            if self.chain.created:
+                self.chain.rebuild(self.transactions)
+                if self.transactions:
+                    print(f"Hash chain started over {len(self.transactions)} existing transaction(s).")
+            else:
+                self._report_chain(self.chain.verify())
 
-        # Auto-create CSV files if missing
-        create_file_if_missing(self.customers_file, ["CustomerID", "Name", "Email", "Phone"])
-        create_file_if_missing(self.accounts_file, ["AccountNo", "CustomerID", "Balance"])
-        create_file_if_missing(self.transactions_file, ["Timestamp", "AccountNo", "Action", "Amount"])
+        # Processed idempotency keys (client retries, replayed batch files)
+        self.idempotency = IdempotencyStore(self.idempotency_file)
 
-        # Load data
-        self.customers = read_csv(self.customers_file)
-        self.accounts = read_csv(self.accounts_file)
-        self.transactions = read_csv(self.transactions_file)
+        # Change-data-capture feed of every mutation
+        self.events = ChangeFeed(self.events_file)
+        self.pending_events = []
 
         print("Python Banking System Initialized.\n")
-        print("CSV Folder:", base)
+        print("Data Folder:", base, f"({self.serializer.name})")
+
+    # ---------- SHARED FILE ACCESS ----------
+    def _set_table(self, name, rows):
+        setattr(self, name, rows)
+        if name == "accounts":
+            self._index_accounts()
+        elif name == "customers":
+            self.customer_index = {c["CustomerID"]: c for c in rows}
+
+    def _index_accounts(self):
+        """AccountNo -> row and CustomerID -> [rows], rebuilt whenever accounts are saved or reloaded."""
+        self.account_index = {}
+        self.accounts_by_customer = {}
+        for a in self.accounts:
+            self.account_index[a["AccountNo"]] = a
+            self.accounts_by_customer.setdefault(a["CustomerID"], []).append(a)
+
+    def _writable(self, name):
+        """Copy-on-write: copies a table a snapshot still references before changing it in place.
+
+        Account rows are updated in place, so they are copied too; customer
+        and transaction rows are only ever added or dropped.
+        """
+        if name in self.shared:
+            self.shared.discard(name)
+            rows = getattr(self, name)
+            self._set_table(name, [dict(r) for r in rows] if name == "accounts" else list(rows))
+
+    def snapshot(self, refresh=True):
+        """O(1) point-in-time view for reports, exports and reconciliation."""
+        if refresh:
+            for name in self.tables:
+                self.refresh(name)
+        self.shared.update(self.tables)
+        return Snapshot(self.customers, self.accounts, self.transactions, self.versions)
+
+    def _reload(self, name):
+        filename, _ = self.tables[name]
+        with FileLock(filename):
+            self.versions[name] = read_version(filename)
+            self._set_table(name, self.serializer.load(filename))
+        if name == "transactions":
+            self.velocity.load_history(self.transactions)
+        elif name == "customers":
+            self.dup_index = None
+
+    def refresh(self, name):
+        """Reloads a table only if another process has written it since we last did."""
+        filename, _ = self.tables[name]
+        if read_version(filename) != self.versions.get(name):
+            self._reload(name)
+
+    def _update(self, name, mutate):
+        """Runs mutate(rows) on the latest copy of a table under its file lock, then saves.
+
+        mutate returns the rows to save. It may raise ConflictError when the
+        rows it depends on were changed by another teller; nothing is written
+        then. Only this table is locked, and only for the re-read and write.
+        """
+        filename, fieldnames = self.tables[name]
+        with FileLock(filename):
+            self.refresh(name)
+            if name == "transactions":
+                problems = self.chain.verify()  # the file as it is before this write
+            self._writable(name)
+            self._set_table(name, mutate(getattr(self, name)))
+            self.serializer.save(filename, fieldnames, getattr(self, name))
+            self.versions[name] = bump_version(filename)
+            if name == "transactions":
+                problems += self.chain.sync(self.transactions, self.chain.rows_in_file)
+                self._report_chain(problems)
+
+    def _report_chain(self, problems):
+        """Prints hash chain problems when they appear; quiet until the history verifies again."""
+        if problems and not self.chain_problems:
+            print("WARNING: transaction history does not match its hash chain:")
+            for p in problems:
+                print(f"  {p}")
+        self.chain_problems = problems
+
+    def find_account(self, acc_no):
+        return self.account_index.get(acc_no)
 
     # ---------- CUSTOMER OPS ----------
-    def add_customer(self):
-        cid = "C" + str(len(self.customers) + 1).zfill(3)
+    def duplicate_matches(self, name, email, phone):
+        """Existing customers resembling the given details (index built on first use)."""
+        self.refresh("customers")
+        if self.dup_index is None:
+            self.dup_index = DuplicateIndex(self.customers)
+        return self.dup_index.matches(name, email, phone)
 
+    def add_customer(self):
         name = input("Enter Customer Name: ").title()
         email = input("Enter Email: ")
         phone = input("Enter Phone: ")
 
-        # Save customer
-        customer = Customer(cid, name, email, phone).to_dict()
-        self.customers.append(customer)
-        write_csv(self.customers_file,
-                  ["CustomerID", "Name", "Email", "Phone"], self.customers)
+        matches = self.duplicate_matches(name, email, phone)
+        if matches:
+            print("\nWarning: this customer may already exist:")
+            for cid, reasons in matches:
+                print(f"  {cid} (matching {reasons.replace('+', ', ')})")
+            if input("Add anyway? (y/n): ").lower().strip() != "y":
+                print("Operation cancelled.")
+                return
+
+        # Save customer (the ID is assigned against the latest file)
+        customer = {}
+
+        def add_customer_row(rows):
+            cid = next_id(rows, "CustomerID", "C", 3)
+            customer.update(Customer(cid, name, email, phone).to_dict())
+            rows.append(customer)
+            return rows
 
+        self._update("customers", add_customer_row)
+        cid = customer["CustomerID"]
+        if self.dup_index is not None:
+            self.dup_index.add(customer)
+
+        self.events.publish("customer_added", customer)
         print(f"Customer '{name}' added successfully with ID {cid}.")
 
         # Auto-create first account
-        acc_no = "A" + str(len(self.accounts) + 1).zfill(4)
-        new_acc = SavingsAccount(acc_no, cid, 0.0)
-
-        self.accounts.append(new_acc.to_dict())
-        write_csv(self.accounts_file,
-                  ["AccountNo", "CustomerID", "Balance"], self.accounts)
+        acc_no = self._create_account(cid)
 
         print("\nAccount Created Automatically")
         print("----------------------------")
@@ -140,8 +302,57 @@ class BankingSystem:
         print(f"Customer ID    : {cid}")
         print("Initial Balance: 0.00\n")
 
+    def _create_account(self, cid):
+        new_acc = {}
+
+        def add_account_row(rows):
+            acc_no = next_id(rows, "AccountNo", "A", 4)
+            new_acc.update(SavingsAccount(acc_no, cid, 0.0).to_dict())
+            rows.append(new_acc)
+            return rows
+
+        self._update("accounts", add_account_row)
+        self.events.publish("account_created", dict(new_acc))
+        return new_acc["AccountNo"]
+
+    def open_account(self):
+        cid = input("Enter Customer ID: ").upper().strip()
+        self.refresh("customers")
+        if cid not in self.customer_index:
+            print("Customer not found.")
+            return
+
+        acc_no = self._create_account(cid)
+        count = len(self.accounts_by_customer.get(cid, []))
+        print("\nAdditional Account Opened")
+        print("-------------------------")
+        print(f"Account Number : {acc_no}")
+        print(f"Customer ID    : {cid}")
+        print(f"Total Accounts : {count}")
+        print("Initial Balance: 0.00\n")
+
+    # ---------- CUSTOMER PORTFOLIO ----------
+    def portfolio(self, cid):
+        """(accounts, total balance) of one customer; O(accounts of that customer)."""
+        accounts = self.accounts_by_customer.get(cid, [])
+        return accounts, sum(float(a["Balance"]) for a in accounts)
+
+    def view_portfolio(self):
+        cid = input("Enter Customer ID: ").upper().strip()
+        self.refresh("accounts")
+        accounts, total = self.portfolio(cid)
+        if not accounts:
+            print("No accounts found for this customer.")
+            return
+
+        print(f"\n--- Portfolio of {cid} ---")
+        for a in accounts:
+            print(f"{a['AccountNo']} | {float(a['Balance']):.2f}")
+        print(f"Total Balance: {total:.2f} across {len(accounts)} account(s)")
+
     # ---------- VIEW CUSTOMERS ----------
     def view_customers(self):
+        self.refresh("customers")
         if not self.customers:
             print("No customers available.")
             return
@@ -152,6 +363,7 @@ class BankingSystem:
 
     # ---------- VIEW ACCOUNTS ----------
     def list_accounts(self):
+        self.refresh("accounts")
         if not self.accounts:
             print("No accounts found.")
             return
@@ -160,7 +372,7 @@ class BankingSystem:
         for a in self.accounts:
             print(f"{a['AccountNo']} | {a['CustomerID']} | {float(a['Balance']):.2f}")
 
-    # ---------- REMOVE ACCOUNT + REMOVE CUSTOMER ----------
+    # ---------- REMOVE ACCOUNT (+ CUSTOMER WITH THEIR LAST ACCOUNT) ----------
     def remove_account(self):
         acc_no = input("Enter Account Number to remove: ").upper().strip()
         if not acc_no:
@@ -168,104 +380,367 @@ class BankingSystem:
             return
 
         # Find account
-        account = next((a for a in self.accounts if a["AccountNo"] == acc_no), None)
+        self.refresh("accounts")
+        account = self.find_account(acc_no)
         if not account:
             print("Account not found.")
             return
 
         cust_id = account["CustomerID"]
+        last_account = len(self.accounts_by_customer.get(cust_id, [])) == 1
 
-        confirm = input(
-            f"Delete Account {acc_no} AND its Customer {cust_id}? (y/n): "
-        ).lower().strip()
+        if last_account:
+            prompt = f"Delete Account {acc_no} AND its Customer {cust_id}? (y/n): "
+        else:
+            prompt = f"Delete Account {acc_no} of Customer {cust_id}? (y/n): "
+        confirm = input(prompt).lower().strip()
 
         if confirm != "y":
             print("Operation cancelled.")
             return
 
-        # 1. Remove account
-        self.accounts = [a for a in self.accounts if a["AccountNo"] != acc_no]
-        write_csv(self.accounts_file,
-                  ["AccountNo", "CustomerID", "Balance"], self.accounts)
-
-        # 2. Remove customer
-        self.customers = [c for c in self.customers if c["CustomerID"] != cust_id]
-        write_csv(self.customers_file,
-                  ["CustomerID", "Name", "Email", "Phone"], self.customers)
-
-        # 3. Remove transactions
-        self.transactions = [t for t in self.transactions if t["AccountNo"] != acc_no]
-        write_csv(self.transactions_file,
-                  ["Timestamp", "AccountNo", "Action", "Amount"], self.transactions)
+        with FileLock(self.accounts_file), FileLock(self.transactions_file):
+            # Removing history re-chains it, so it must verify first
+            problems = self.chain.verify()
+            if problems:
+                self._report_chain(problems)
+                print("Account not removed. Resolve the problems above first (python hashchain.py verify).")
+                return
 
-        print(f"\nAccount {acc_no} and Customer {cust_id} deleted successfully.\n")
+            # 1. Remove account
+            def drop_account(rows):
+                row = self.find_account(acc_no)
+                if row is not None:
+                    rows.remove(row)
+                return rows
+
+            self._update("accounts", drop_account)
+            self.events.publish("account_removed", {"AccountNo": acc_no, "CustomerID": cust_id})
+
+            # 2. Remove customer, unless they still hold other accounts
+            removed_customer = cust_id not in self.accounts_by_customer
+            if removed_customer:
+                def drop_customer(rows):
+                    row = self.customer_index.get(cust_id)
+                    if row is not None:
+                        rows.remove(row)
+                    return rows
+
+                self._update("customers", drop_customer)
+                if self.dup_index is not None:
+                    self.dup_index.remove(cust_id)
+                self.events.publish("customer_removed", {"CustomerID": cust_id})
+
+            # 3. Remove transactions
+            before = len(self.chain)
+            self._update("transactions", lambda rows: [t for t in rows if t["AccountNo"] != acc_no])
+            if len(self.transactions) != before:
+                self.chain.rebuild(self.transactions)
+
+        if removed_customer:
+            print(f"\nAccount {acc_no} and Customer {cust_id} deleted successfully.\n")
+        else:
+            print(f"\nAccount {acc_no} deleted successfully. Customer {cust_id} keeps their other accounts.\n")
 
     # ---------- TRANSACTION OPS ----------
-    def log_transaction(self, acc_no, action, amount):
+    def log_transaction(self, acc_no, action, amount, timestamp=None, persist=True):
         entry = {
-            "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "Timestamp": (timestamp or datetime.now()).strftime("%Y-%m-%d %H:%M:%S"),
             "AccountNo": acc_no,
             "Action": action,
             "Amount": amount
         }
-        self.transactions.append(entry)
-        write_csv(self.transactions_file,
-                  ["Timestamp", "AccountNo", "Action", "Amount"], self.transactions)
+        if persist:
+            self._update("transactions", lambda rows: rows + [entry])
+        else:
+            self._writable("transactions")
+            self.transactions.append(entry)
+
+    def _keyed(self, idempotency_key, persist, post):
+        """Runs post() once its idempotency key is claimed; None if the key was already used.
+
+        The key is claimed under the accounts and transactions locks, so two
+        teller processes retrying the same posting cannot both apply it. With
+        persist=True the claim is committed with the posting; with
+        persist=False the caller commits it (save_postings) and a rejected
+        posting gives its claim back.
+        """
+        if not idempotency_key:
+            return post()
+        with FileLock(self.accounts_file), FileLock(self.transactions_file):
+            if not self.idempotency.claim(idempotency_key):
+                print(f"Duplicate posting '{idempotency_key}' ignored.")
+                return None
+            try:
+                result = post()
+            except BaseException:
+                if persist:
+                    self.idempotency.rollback()
+                else:
+                    self.idempotency.release(idempotency_key)
+                raise
+            if persist:
+                self.idempotency.commit()
+            return result
+
+    def post_transaction(self, acc_no, action, amount=None, idempotency_key=None, persist=True,
+                         check_velocity=True):
+        """Applies one posting and logs it. Raises ValueError if it is rejected.
+
+        All checks run before anything is changed, so a rejected posting
+        leaves the account, the CSV files and the velocity windows untouched.
+        A posting whose idempotency_key was already processed is skipped and
+        None is returned. With persist=False the caller saves the files.
+        Pre-authorised postings (standing orders) pass check_velocity=False.
+        """
+        return self._keyed(idempotency_key, persist, lambda: self._post_transaction(
+            acc_no, action, amount, persist, check_velocity))
+
+    def _post_transaction(self, acc_no, action, amount, persist, check_velocity):
+        for _ in range(MAX_RETRIES):
+            if persist:
+                self.refresh("accounts")
+            acc = self.find_account(acc_no)
+            if not acc:
+                raise ValueError("Account not found.")
+
+            base_balance = float(acc["Balance"])
+            account = SavingsAccount(acc_no, acc["CustomerID"], base_balance)
+            now = datetime.now()
+
+            if action == "deposit":
+                account.deposit(amount)
+            elif action == "withdraw":
+                if check_velocity and 0 < amount <= account.balance:
+                    if persist:
+                        self.refresh("transactions")  # count other tellers' withdrawals
+                    self.velocity.check(acc_no, amount, now)
+                account.withdraw(amount)
+            elif action == "interest":
+                amount = account.add_interest(amount)
+            else:
+                raise ValueError("Invalid action.")
+
+            def apply_balance(rows):
+                row = self.find_account(acc_no)
+                if row is None:
+                    raise ValueError("Account not found.")
+                if float(row["Balance"]) != base_balance:
+                    raise ConflictError(acc_no)
+                row["Balance"] = account.balance
+                return rows
+
+            # Update balance in CSV list
+            if not persist:
+                self._writable("accounts")
+                apply_balance(self.accounts)
+                break
+            try:
+                self._update("accounts", apply_balance)
+                break
+            except ConflictError:
+                print(f"Account {acc_no} was changed by another teller. Retrying...")
+        else:
+            raise ValueError("Account is busy. Please try again.")
+
+        # Log transaction
+        self.log_transaction(acc_no, action, amount, now, persist)
+        event = dict(self.transactions[-1], Balance=account.balance)
+        if persist:
+            self.events.publish("posting", event)
+        else:
+            self.pending_events.append(("posting", event))
+        if action == "withdraw" and check_velocity:
+            self.velocity.record(acc_no, amount, now)
+        return account
+
+    def post_transfer(self, from_acc, to_acc, amount, idempotency_key=None, persist=True,
+                      check_velocity=True):
+        """Moves amount between two accounts as a withdraw leg and a deposit leg.
+
+        The target is checked first, so a rejected transfer changes nothing.
+        Both legs are always saved together: inside post_many with the rest of
+        the batch, on their own under both locks in one save, after which the
+        idempotency key is committed. If anything fails in between, neither
+        leg nor the key is kept.
+        """
+        if not persist:
+            return self._keyed(idempotency_key, False, lambda: self._post_transfer(
+                from_acc, to_acc, amount, check_velocity))
+        with FileLock(self.accounts_file), FileLock(self.transactions_file):
+            self.refresh("accounts")
+            self.refresh("transactions")
+            try:
+                account = self._keyed(idempotency_key, False, lambda: self._post_transfer(
+                    from_acc, to_acc, amount, check_velocity))
+                if account is not None:
+                    self.save_postings()
+            except BaseException:
+                self._discard_postings()
+                raise
+        return account
+
+    def _post_transfer(self, from_acc, to_acc, amount, check_velocity):
+        """Applies both legs in memory; the caller holds both locks and saves them."""
+        if from_acc == to_acc:
+            raise ValueError("Cannot transfer to the same account.")
+        if not self.find_account(to_acc):
+            raise ValueError("Target account not found.")
+
+        account = self.post_transaction(from_acc, "withdraw", amount, persist=False,
+                                        check_velocity=check_velocity)
+        self.post_transaction(to_acc, "deposit", amount, persist=False)
+        return account
+
+    def save_postings(self):
+        """Writes accounts and transactions once after a run of persist=False postings.
+
+        Callers hold both file locks for the whole run (see post_batch).
+        """
+        self._update("accounts", lambda rows: rows)
+        self._update("transactions", lambda rows: rows)
+        self.idempotency.commit()
+        for event_type, data in self.pending_events:
+            self.events.publish(event_type, data)
+        self.pending_events.clear()
+
+    def _discard_postings(self):
+        """Drops unsaved persist=False postings: their key claims, events and in-memory rows."""
+        self.idempotency.rollback()
+        self.pending_events.clear()
+        self._reload("accounts")
+        self._reload("transactions")
+
+    def post_batch(self, filename):
+        """Posts every row of a batch CSV (AccountNo, Action, Amount[, ToAccount, IdempotencyKey]).
+
+        A "transfer" row moves Amount from AccountNo to ToAccount. The whole
+        file is keyed by its SHA-256, so replaying a processed file is a
+        no-op. Rows without their own key get one derived from the file hash
+        and row number, so a batch interrupted halfway can be re-run.
+        """
+        batch_key = "batch:" + file_digest(filename)
+        if self.idempotency.seen(batch_key):
+            print("Batch file already processed. Nothing to do.")
+            return 0, 0
+
+        def parse(item):
+            line_no, row = item
+            acc_no = (row.get("AccountNo") or "").strip().upper()
+            action = (row.get("Action") or "").strip().lower()
+            if not acc_no or not action:
+                raise ValueError("AccountNo and Action are required.")
+            amount = (row.get("Amount") or "").strip()
+            if not amount:
+                raise ValueError("Amount is required.")
+            try:
+                amount = float(amount)
+            except ValueError:
+                raise ValueError(f"Invalid amount '{amount}'.") from None
+            if action == "transfer":
+                to_acc = (row.get("ToAccount") or "").strip().upper()
+                if not to_acc:
+                    raise ValueError("ToAccount is required for a transfer.")
+                acc_no = (acc_no, to_acc)
+            key = (row.get("IdempotencyKey") or "").strip() or f"{batch_key}:{line_no}"
+            return acc_no, action, amount, key
+
+        rows = ((f"Line {line_no}", (line_no, row))
+                for line_no, row in enumerate(read_csv(filename), start=2))
+        return self.post_many(rows, batch_key, parse=parse)
+
+    def post_many(self, postings, batch_key=None, check_velocity=True, parse=None):
+        """Bulk posting path: (label, AccountNo, Action, Amount, IdempotencyKey) tuples.
+
+        With parse, postings are (label, raw) pairs and parse(raw) returns the
+        other four fields, so a malformed row is rejected like any other.
+        Both files stay locked for the run and are saved once at the end.
+        Rejected rows are reported by label and do not stop the run. Any
+        other error aborts the whole batch: balances and history are reloaded
+        from disk and its idempotency claims and events are dropped.
+        For a "transfer" the AccountNo is a (from, to) pair.
+        """
+        posted = failed = 0
+        with FileLock(self.accounts_file), FileLock(self.transactions_file):
+            self.refresh("accounts")
+            self.refresh("transactions")
+            try:
+                for posting in postings:
+                    label = posting[0]
+                    try:
+                        if parse:
+                            acc_no, action, amount, key = parse(posting[1])
+                        else:
+                            _, acc_no, action, amount, key = posting
+                        if action == "transfer":
+                            if not (isinstance(acc_no, tuple) and len(acc_no) == 2):
+                                raise ValueError("A transfer needs a (from, to) account pair.")
+                            result = self.post_transfer(*acc_no, amount, idempotency_key=key,
+                                                        persist=False, check_velocity=check_velocity)
+                        else:
+                            result = self.post_transaction(acc_no, action, amount, idempotency_key=key,
+                                                           persist=False, check_velocity=check_velocity)
+                        if result:
+                            posted += 1
+                    except ValueError as e:
+                        failed += 1
+                        print(f"{label}: {e}")
+
+                if batch_key:
+                    self.idempotency.claim(batch_key)
+                self.save_postings()
+            except BaseException:
+                self._discard_postings()
+                raise
+        print(f"Batch complete: {posted} posted, {failed} rejected.")
+        return posted, failed
 
     def transaction(self, action):
         acc_no = input("Enter Account Number: ").upper()
 
-        acc = next((a for a in self.accounts if a["AccountNo"] == acc_no), None)
+        self.refresh("accounts")
+        acc = self.find_account(acc_no)
         if not acc:
             print("Account not found.")
             return
 
-        account = SavingsAccount(acc_no, acc["CustomerID"], float(acc["Balance"]))
-
         try:
             amount = float(input("Enter Amount: "))
+            self.post_transaction(acc_no, action, amount)
 
-            if action == "deposit":
-                account.deposit(amount)
-            elif action == "withdraw":
-                account.withdraw(amount)
-            elif action == "interest":
-                account.add_interest()
-            else:
-                print("Invalid action.")
-                return
-
-            # Update balance in CSV list
-            for a in self.accounts:
-                if a["AccountNo"] == acc_no:
-                    a["Balance"] = account.balance
-
-            write_csv(self.accounts_file,
-                      ["AccountNo", "CustomerID", "Balance"], self.accounts)
+        except ValueError as e:
+            print(f"Error: {e}")
 
-            # Log transaction
-            self.log_transaction(acc_no, action, amount)
+    def add_interest(self):
+        """Credits average-daily-balance interest for a period to every account."""
+        from interest import post_interest  # interest imports reconcile, which imports this module
 
+        today = datetime.now().date()
+        default_start = today.replace(day=1)
+        start = input(f"Period start (YYYY-MM-DD) [{default_start}]: ").strip()
+        end = input(f"Period end (YYYY-MM-DD) [{today}]: ").strip()
+        try:
+            start = datetime.strptime(start, "%Y-%m-%d").date() if start else default_start
+            end = datetime.strptime(end, "%Y-%m-%d").date() if end else today
+            post_interest(self, start, end)
         except ValueError as e:
             print(f"Error: {e}")
 
     # ---------- REPORTS ----------
     def show_reports(self):
         print("\n--- Banking Reports ---")
+        view = self.snapshot()
 
-        if not self.accounts:
+        if not view.accounts:
             print("No accounts found.")
             return
 
-        total_balance = sum(float(a["Balance"]) for a in self.accounts)
+        total_balance = sum(float(a["Balance"]) for a in view.accounts)
         print(f"Total Bank Balance: {total_balance:.2f}")
 
-        top_accounts = sorted(
-            self.accounts, key=lambda x: float(x["Balance"]), reverse=True)[:3]
-
         print("\nTop 3 Balances:")
-        for a in top_accounts:
-            print(f"{a['AccountNo']} - {a['Balance']}")
+        for a in top_accounts(view, 3):
+            print(f"{a['AccountNo']} - {a['Name']} - {a['Balance']:.2f}")
 
 
 # --------------------------------------------
@@ -300,6 +775,20 @@ def main():
 
     system = BankingSystem()
 
+    # Optional change feed for downstream consumers (python events.py --port N)
+    events_port = os.environ.get("BANKING_EVENTS_PORT")
+    if events_port:
+        try:
+            system.events.serve(int(events_port))
+            print(f"Change feed listening on 127.0.0.1:{events_port}")
+        except OSError as e:
+            print(f"Change feed not started: {e}")
+
+    # Catch up on standing orders that fell due while the app was down
+    if os.path.exists(ORDERS_FILE):
+        print("\nRunning due standing orders...")
+        run_due_orders(system)
+
     while True:
         print("\n===== MAIN MENU =====")
         print("1. Add Customer (Customer + Auto Account)")
@@ -309,8 +798,11 @@ def main():
         print("5. Withdraw")
         print("6. Add Interest")
         print("7. Reports")
-        print("8. Remove Account (Deletes Customer Too)")
-        print("9. Exit")
+        print("8. Remove Account (Deletes Customer With Last Account)")
+        print("9. Post Batch File")
+        print("10. Open Additional Account")
+        print("11. Customer Portfolio")
+        print("0. Exit")
 
         choice = input("Enter choice: ")
 
@@ -325,12 +817,25 @@ def main():
         elif choice == "5":
             system.transaction("withdraw")
         elif choice == "6":
-            system.transaction("interest")
+            system.add_interest()
         elif choice == "7":
             system.show_reports()
         elif choice == "8":
             system.remove_account()
         elif choice == "9":
+            path = input("Enter batch CSV path: ").strip()
+            if os.path.exists(path):
+                try:
+                    system.post_batch(path)
+                except Exception as e:
+                    print(f"Batch aborted: {e}")
+            else:
+                print("File not found.")
+        elif choice == "10":
+            system.open_account()
+        elif choice == "11":
+            system.view_portfolio()
+        elif choice == "0":
             print("Exiting system.")
             break
         else:
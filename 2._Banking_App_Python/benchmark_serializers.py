@@ -0,0 +1,56 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from serializers import SERIALIZERS, get_serializer
+
+FIELDS = ["Timestamp", "AccountNo", "Action", "Amount"]
+
+
+def sample_transactions(n, seed=7):
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    return [{
+        "Timestamp": (start + timedelta(seconds=i * 37)).strftime("%Y-%m-%d %H:%M:%S"),
+        "AccountNo": f"A{rng.randint(1, 5000):04d}",
+        "Action": rng.choice(("deposit", "withdraw", "interest")),
+        "Amount": round(rng.uniform(1, 50000), 2),
+    } for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare banking storage formats on the same data.")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs")
+    args = parser.parse_args()
+
+    rows = sample_transactions(args.rows)
+    print(f"{args.rows} transaction rows, best of {args.repeat}\n")
+    print(f"{'Format':<10}{'Save (s)':>10}{'Load (s)':>10}{'Size (MB)':>12}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in SERIALIZERS:
+            try:
+                serializer = get_serializer(name)
+            except ImportError:
+                print(f"{name:<10}{'skipped (dependency not installed)':>32}")
+                continue
+            path = os.path.join(tmp, "transactions" + serializer.extension)
+            save_times, load_times = [], []
+            for _ in range(args.repeat):
+                t = time.perf_counter()
+                serializer.save(path, FIELDS, rows)
+                save_times.append(time.perf_counter() - t)
+                t = time.perf_counter()
+                loaded = serializer.load(path)
+                load_times.append(time.perf_counter() - t)
+            assert len(loaded) == len(rows)
+            size = os.path.getsize(path) / (1024 * 1024)
+            print(f"{name:<10}{min(save_times):>10.3f}{min(load_times):>10.3f}{size:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# --------------------------------------------
+# Inter-process coordination for the data files
+# --------------------------------------------
+class ConflictError(Exception):
+    """Another process changed the row this operation was based on."""
+
+
+class FileLock:
+    """Advisory exclusive lock on '<filename>.lock', shared by every teller process.
+
+    Re-entrant within a process, so a bulk operation can hold the lock while
+    the single-row helpers it calls take it again.
+    """
+
+    _held = {}
+    _guard = threading.RLock()
+
+    def __init__(self, filename, timeout=30.0, poll=0.05):
+        self.path = os.path.abspath(filename) + ".lock"
+        self.timeout = timeout
+        self.poll = poll
+
+    def __enter__(self):
+        with FileLock._guard:
+            held = FileLock._held.get(self.path)
+            if held:
+                held[1] += 1
+                return self
+        f = open(self.path, "a+b")
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                if fcntl:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    f.close()
+                    raise TimeoutError(f"Could not lock {self.path}; another teller is holding it.")
+                time.sleep(self.poll)
+        with FileLock._guard:
+            FileLock._held[self.path] = [f, 1]
+        return self
+
+    def __exit__(self, *exc):
+        with FileLock._guard:
+            held = FileLock._held[self.path]
+            held[1] -= 1
+            if held[1]:
+                return False
+            del FileLock._held[self.path]
+        f = held[0]
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        f.close()
+        return False
+
+
+def read_version(filename):
+    """Version stamp of a data file (0 if it was never stamped)."""
+    try:
+        with open(filename + ".version", "r", encoding="utf-8") as f:
+            return int(f.read().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def bump_version(filename):
+    """Increments the stamp; call only while holding the file's FileLock."""
+    version = read_version(filename) + 1
+    tmp = filename + ".version.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(str(version))
+    os.replace(tmp, filename + ".version")
+    return version
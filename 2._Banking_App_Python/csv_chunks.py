@@ -0,0 +1,42 @@
+import csv
+import io
+import os
+
+
+# --------------------------------------------
+# Byte-range chunking for large CSV files
+# --------------------------------------------
+# Rows are assumed not to contain quoted newlines, which holds for every file
+# the banking app writes.
+
+CHUNK_SIZE = 64 * 1024 * 1024
+
+
+def read_header(filename):
+    with open(filename, "r", newline="", encoding="utf-8") as f:
+        return next(csv.reader(f), [])
+
+
+def byte_ranges(filename, chunk_size=CHUNK_SIZE):
+    """Splits the data rows of a CSV into (start, end) byte ranges on line boundaries."""
+    size = os.path.getsize(filename)
+    ranges = []
+    with open(filename, "rb") as f:
+        f.readline()  # header
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + chunk_size, size))
+            if f.tell() < size:
+                f.readline()  # move to the end of the current line
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def read_rows(filename, start, end):
+    """Returns the rows of one byte range as lists of strings."""
+    with open(filename, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return csv.reader(io.StringIO(data.decode("utf-8"), newline=""))
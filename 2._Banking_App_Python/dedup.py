@@ -0,0 +1,201 @@
+import argparse
+import csv
+import hashlib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+
+NUM_PERM = 32
+BANDS = 8  # 8 bands x 4 rows: pairs with name Jaccard >~ 0.6 usually share a bucket
+ROWS_PER_BAND = NUM_PERM // BANDS
+MAX_BUCKET = 50  # larger buckets are placeholders ("n/a" emails, 0000 phones), not people
+# One 64-bit hash per shingle, XOR-ed with a fixed random mask per "permutation":
+# cheaper than (a*x + b) mod p in pure Python and just as good for blocking.
+_MASKS = [int.from_bytes(hashlib.blake2b(f"minhash-{i}".encode(), digest_size=8).digest(), "little")
+          for i in range(NUM_PERM)]
+
+
+# --------------------------------------------
+# Normalisation
+# --------------------------------------------
+def normalize_name(name):
+    tokens = re.sub(r"[^a-z0-9 ]+", " ", (name or "").lower()).split()
+    return " ".join(sorted(tokens))
+
+
+def normalize_email(email):
+    email = (email or "").strip().lower()
+    local, _, domain = email.partition("@")
+    if not domain:
+        return ""
+    local = local.split("+", 1)[0]
+    if domain in ("gmail.com", "googlemail.com"):
+        local, domain = local.replace(".", ""), "gmail.com"
+    return f"{local}@{domain}"
+
+
+def normalize_phone(phone):
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-10:] if len(digits) >= 7 else ""
+
+
+def shingles(text, k=3):
+    text = f" {text} "
+    return {text[i:i + k] for i in range(max(1, len(text) - k + 1))}
+
+
+# --------------------------------------------
+# MinHash / LSH
+# --------------------------------------------
+def minhash(shingle_set):
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+              for s in shingle_set]
+    return [min([h ^ mask for h in hashes]) for mask in _MASKS]
+
+
+def band_keys(signature):
+    return [(band, tuple(signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]))
+            for band in range(BANDS)]
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def profile(customer):
+    """Normalised fields and name shingles of one customer."""
+    name = normalize_name(customer["Name"])
+    return {
+        "id": customer["CustomerID"],
+        "name": name,
+        "email": normalize_email(customer["Email"]),
+        "phone": normalize_phone(customer["Phone"]),
+        "shingles": shingles(name),
+    }
+
+
+def score(p, q):
+    """(is_duplicate, name similarity, reasons) for two customer profiles."""
+    name_sim = jaccard(p["shingles"], q["shingles"])
+    reasons = []
+    if p["email"] and p["email"] == q["email"]:
+        reasons.append("email")
+    if p["phone"] and p["phone"] == q["phone"]:
+        reasons.append("phone")
+    if name_sim >= 0.6:
+        reasons.append("name")
+    likely = name_sim >= 0.9 or len(reasons) >= 2
+    return likely, name_sim, reasons
+
+
+def _signatures(profiles):
+    return [band_keys(minhash(p["shingles"])) for p in profiles]
+
+
+# --------------------------------------------
+# Batch job
+# --------------------------------------------
+def find_duplicates(customers, workers=None, chunk=20000):
+    """Candidate duplicate pairs in near-linear time.
+
+    Customers are only compared within blocks: same normalised email, same
+    phone, or a shared MinHash LSH band of the name. Returns
+    (id_a, id_b, name similarity, reasons) for likely duplicates.
+    """
+    profiles = [profile(c) for c in customers]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = pool.map(_signatures, [profiles[i:i + chunk] for i in range(0, len(profiles), chunk)])
+        signatures = [sig for part in parts for sig in part]
+
+    buckets = {}
+    for idx, (p, bands) in enumerate(zip(profiles, signatures)):
+        keys = bands + [("email", p["email"]), ("phone", p["phone"])]
+        for key in keys:
+            if key[1]:
+                buckets.setdefault(key, []).append(idx)
+
+    seen = set()
+    results = []
+    for members in buckets.values():
+        if len(members) < 2 or len(members) > MAX_BUCKET:
+            continue
+        for i, j in combinations(members, 2):
+            if (i, j) in seen:
+                continue
+            seen.add((i, j))
+            likely, name_sim, reasons = score(profiles[i], profiles[j])
+            if likely:
+                results.append((profiles[i]["id"], profiles[j]["id"], round(name_sim, 3), "+".join(reasons)))
+    results.sort()
+    return results
+
+
+# --------------------------------------------
+# Inline check for add_customer
+# --------------------------------------------
+class DuplicateIndex:
+    """In-memory LSH/blocking index of existing customers for instant look-ups."""
+
+    def __init__(self, customers=()):
+        self.buckets = {}
+        self.profiles = {}
+        for c in customers:
+            self.add(c)
+
+    def _keys(self, p):
+        keys = band_keys(minhash(p["shingles"])) + [("email", p["email"]), ("phone", p["phone"])]
+        return [k for k in keys if k[1]]
+
+    def add(self, customer):
+        p = profile(customer)
+        self.profiles[p["id"]] = p
+        for key in self._keys(p):
+            self.buckets.setdefault(key, set()).add(p["id"])
+
+    def remove(self, cust_id):
+        p = self.profiles.pop(cust_id, None)
+        if p:
+            for key in self._keys(p):
+                self.buckets.get(key, set()).discard(cust_id)
+
+    def matches(self, name, email, phone):
+        """Existing customers that look like the same person: [(CustomerID, reasons)]."""
+        p = profile({"CustomerID": None, "Name": name, "Email": email, "Phone": phone})
+        candidates = set()
+        for key in self._keys(p):
+            bucket = self.buckets.get(key, ())
+            if len(bucket) <= MAX_BUCKET:
+                candidates.update(bucket)
+        found = []
+        for cid in sorted(candidates):
+            likely, _, reasons = score(p, self.profiles[cid])
+            if likely:
+                found.append((cid, "+".join(reasons)))
+        return found
+
+
+def main():
+    from serializers import configured_serializer, table_path
+
+    serializer = configured_serializer()
+    parser = argparse.ArgumentParser(description="Find likely duplicate customers in the customers table.")
+    parser.add_argument("--customers", default=table_path(BASE, "customers", serializer),
+                        help="customers table in BANKING_FORMAT")
+    parser.add_argument("--out", default=os.path.join(BASE, "duplicate_customers.csv"))
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    pairs = find_duplicates(serializer.load(args.customers), args.workers)
+    with open(args.out, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["CustomerID_A", "CustomerID_B", "NameSimilarity", "MatchedOn"])
+        writer.writerows(pairs)
+    print(f"{len(pairs)} likely duplicate pair(s) written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
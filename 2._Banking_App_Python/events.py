@@ -0,0 +1,225 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import threading
+from array import array
+from datetime import datetime
+
+from concurrency import FileLock
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PORT = 8765
+
+
+# --------------------------------------------
+# Durable Event Log
+# --------------------------------------------
+class EventLog:
+    """Append-only JSON-lines log of banking events, addressed by offset.
+
+    The byte position of every event is kept in memory, so reading from any
+    offset seeks straight to it instead of scanning the file.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.positions = array("q")
+        self.lock = threading.Lock()
+        self.end = 0
+        if not os.path.exists(filename):
+            open(filename, "wb").close()
+        self._scan()
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _scan(self):
+        with open(self.filename, "rb") as f:
+            f.seek(self.end)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn write from a crash; overwritten by the next append
+                self.positions.append(self.end)
+                self.end += len(line)
+
+    def refresh(self):
+        """Picks up events appended by another process since the last call."""
+        with self.lock:
+            self._scan()
+        return len(self.positions)
+
+    def append(self, event_type, data):
+        with self.lock, FileLock(self.filename):
+            self._scan()  # other teller processes may have appended
+            event = {
+                "offset": len(self.positions),
+                "type": event_type,
+                "ts": datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f"),
+                "data": data,
+            }
+            line = (json.dumps(event, default=str) + "\n").encode("utf-8")
+            with open(self.filename, "r+b") as f:
+                f.seek(self.end)
+                f.write(line)
+                f.truncate()
+            self.positions.append(self.end)
+            self.end += len(line)
+        return event
+
+    def read(self, from_offset=0, max_events=None):
+        """Returns the events from from_offset up to the current end."""
+        with self.lock:
+            if from_offset >= len(self.positions):
+                return []
+            start = self.positions[max(0, from_offset)]
+            stop_offset = len(self.positions) if max_events is None else min(
+                len(self.positions), from_offset + max_events)
+            stop = self.end if stop_offset == len(self.positions) else self.positions[stop_offset]
+        with open(self.filename, "rb") as f:
+            f.seek(start)
+            data = f.read(stop - start)
+        return [json.loads(line) for line in data.splitlines()]
+
+
+# --------------------------------------------
+# Change Feed (asyncio fan-out + local socket)
+# --------------------------------------------
+class _Subscriber:
+    def __init__(self, max_pending):
+        self.queue = asyncio.Queue(maxsize=max_pending)
+        self.lagging = False
+
+
+class ChangeFeed:
+    """Publishes every BankingSystem mutation as an ordered, offset-numbered event.
+
+    Events are written to the log first, then pushed to live subscribers on
+    a background asyncio loop. A subscriber whose queue fills up is not
+    allowed to slow the teller down: it is marked as lagging and catches up
+    from the log at its own pace.
+    """
+
+    def __init__(self, filename):
+        self.log = EventLog(filename)
+        self.loop = None
+        self.subscribers = set()
+
+    # ---------- PRODUCER ----------
+    def publish(self, event_type, data):
+        event = self.log.append(event_type, data)
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._fan_out, event)
+        return event
+
+    def _fan_out(self, event):
+        for sub in list(self.subscribers):
+            try:
+                sub.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                sub.lagging = True
+                self.subscribers.discard(sub)
+
+    # ---------- ASYNCIO API ----------
+    def start(self):
+        """Starts the background event loop (idempotent)."""
+        if self.loop is None:
+            ready = threading.Event()
+
+            def run():
+                self.loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(self.loop)
+                ready.set()
+                self.loop.run_forever()
+
+            threading.Thread(target=run, name="change-feed", daemon=True).start()
+            ready.wait()
+        return self.loop
+
+    def run(self, coro):
+        """Schedules a coroutine on the feed's loop; returns a concurrent Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.start())
+
+    async def subscribe(self, from_offset=0, max_pending=1000):
+        """Async generator yielding events in offset order, starting at from_offset.
+
+        Must be consumed on the feed's loop (see run()).
+        """
+        loop = asyncio.get_running_loop()
+        next_offset = from_offset
+        while True:
+            sub = _Subscriber(max_pending)
+            self.subscribers.add(sub)
+            try:
+                # Catch up from the log; live events queued meanwhile are de-duplicated by offset
+                while next_offset < len(self.log):
+                    batch = await loop.run_in_executor(None, self.log.read, next_offset, 5000)
+                    for event in batch:
+                        yield event
+                        next_offset = event["offset"] + 1
+                while not (sub.lagging and sub.queue.empty()):
+                    event = await sub.queue.get()
+                    if event["offset"] > next_offset:
+                        # Events appended by other processes are only in the log
+                        self.log.refresh()
+                        gap = await loop.run_in_executor(
+                            None, self.log.read, next_offset, event["offset"] - next_offset)
+                        for missed in gap:
+                            yield missed
+                            next_offset = missed["offset"] + 1
+                    if event["offset"] >= next_offset:
+                        yield event
+                        next_offset = event["offset"] + 1
+            finally:
+                self.subscribers.discard(sub)
+
+    # ---------- LOCAL SOCKET ----------
+    def serve(self, port=DEFAULT_PORT, host="127.0.0.1"):
+        """Streams events as JSON lines to local clients.
+
+        A client sends its starting offset as one line, then reads events.
+        Slow clients apply backpressure through the socket buffer.
+        """
+        async def handle(reader, writer):
+            try:
+                line = await reader.readline()
+                from_offset = int(line.strip() or 0)
+                async for event in self.subscribe(from_offset):
+                    writer.write((json.dumps(event) + "\n").encode("utf-8"))
+                    await writer.drain()
+            except (ConnectionError, ValueError):
+                pass
+            finally:
+                writer.close()
+
+        async def start_server():
+            return await asyncio.start_server(handle, host, port)
+
+        return self.run(start_server()).result()
+
+
+def read_events(port=DEFAULT_PORT, from_offset=0, host="127.0.0.1"):
+    """Client helper: yields events from a running change feed, forever."""
+    with socket.create_connection((host, port)) as conn:
+        conn.sendall(f"{from_offset}\n".encode("utf-8"))
+        with conn.makefile("r", encoding="utf-8") as stream:
+            for line in stream:
+                yield json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Follow the banking change feed.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--from", dest="from_offset", type=int, default=0, help="offset to resume from")
+    args = parser.parse_args()
+
+    try:
+        for event in read_events(args.port, args.from_offset):
+            print(f"{event['offset']} | {event['ts']} | {event['type']} | {json.dumps(event['data'])}")
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+
+from concurrency import FileLock
+from serializers import configured_serializer, table_path
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+
+GENESIS = "0" * 64
+CHECKPOINT_EVERY = 1024
+LINE_LEN = 12 + 1 + 64 + 1 + 64 + 1  # "index leaf chain\n", fixed width for O(1) seeks
+
+
+# --------------------------------------------
+# Hashing helpers
+# --------------------------------------------
+def _sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def leaf_hash(row):
+    """Hash of one transaction row; amounts are canonicalised so '500' == '500.0'."""
+    fields = (row["Timestamp"], row["AccountNo"], row["Action"], repr(float(row["Amount"])))
+    return _sha("|".join(fields).encode("utf-8"))
+
+
+def chain_hash(prev, leaf):
+    return _sha((prev + leaf).encode("ascii"))
+
+
+def merkle_levels(leaves):
+    """All levels of the Merkle tree, leaves first. An odd node is paired with itself."""
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        levels.append([_sha(bytes.fromhex(level[i]) + bytes.fromhex(level[min(i + 1, len(level) - 1)]))
+                       for i in range(0, len(level), 2)])
+    return levels
+
+
+def verify_proof(leaf, proof, root):
+    """Checks an inclusion proof from prove(); O(log n) hashes."""
+    node = leaf
+    for sibling, side in proof:
+        pair = sibling + node if side == "L" else node + sibling
+        node = _sha(bytes.fromhex(pair))
+    return node == root
+
+
+# --------------------------------------------
+# Hash Chain with Merkle checkpoints
+# --------------------------------------------
+class HashChain:
+    """Tamper-evident companion files for transactions.csv.
+
+    '<file>.chain' holds one fixed-width line per row: its index, the row's
+    leaf hash and the chain hash linking it to every row before it.
+    '<file>.checkpoints' holds a Merkle root for every CHECKPOINT_EVERY rows
+    together with the chain hash at that point. '<file>.verified' remembers
+    how far (row and byte offset) the file has been verified.
+    """
+
+    def __init__(self, transactions_file, serializer=None):
+        self.transactions_file = transactions_file
+        self.serializer = serializer  # None or csv: verify streams the CSV from a byte offset
+        self.chain_file = transactions_file + ".chain"
+        self.checkpoint_file = transactions_file + ".checkpoints"
+        self.verified_file = transactions_file + ".verified"
+        self.rows_in_file = None  # set by verify()
+        # True when neither companion file existed, i.e. history has never been chained
+        self.created = not (os.path.exists(self.chain_file) or os.path.exists(self.checkpoint_file))
+        for path in (self.chain_file, self.checkpoint_file):
+            if not os.path.exists(path):
+                open(path, "wb").close()
+
+    # ---------- CHAIN FILE ----------
+    def __len__(self):
+        return os.path.getsize(self.chain_file) // LINE_LEN
+
+    def _entries(self, start, stop):
+        """(leaf, chain) for rows [start, stop)."""
+        with open(self.chain_file, "rb") as f:
+            f.seek(start * LINE_LEN)
+            data = f.read((stop - start) * LINE_LEN).decode("ascii")
+        return [(data[i + 13:i + 77], data[i + 78:i + 142]) for i in range(0, len(data), LINE_LEN)]
+
+    def head(self):
+        count = len(self)
+        return self._entries(count - 1, count)[0][1] if count else GENESIS
+
+    def checkpoints(self):
+        with open(self.checkpoint_file, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    # ---------- APPEND ----------
+    def sync(self, rows, start):
+        """Chains rows[start:], the rows the app has just appended; returns a list of problems.
+
+        start is the number of rows the file held before the append (see
+        rows_in_file after verify()). Rows that reached the file some other
+        way are never chained: if the chain does not end at start, nothing is
+        chained and the gap is reported. Call under the transactions lock.
+        """
+        count = len(self)
+        if count < start:
+            return [f"Rows {count + 1}-{start} are not in the chain; new rows are not chained until "
+                    "they are reviewed and 'python hashchain.py rebuild --accept' is run."]
+        if count > start:
+            return [f"The chain covers {count} rows but the file held {start}; nothing was chained."]
+        if len(rows) <= count:
+            return []
+        prev = self.head()
+        lines = []
+        for i in range(count, len(rows)):
+            leaf = leaf_hash(rows[i])
+            prev = chain_hash(prev, leaf)
+            lines.append(f"{i:012d} {leaf} {prev}\n")
+        with open(self.chain_file, "a", encoding="ascii", newline="") as f:
+            f.writelines(lines)
+        self._write_checkpoints()
+        return []
+
+    def _write_checkpoints(self):
+        done = self.checkpoints()
+        last = done[-1]["index"] if done else 0
+        count = len(self)
+        new = []
+        while last + CHECKPOINT_EVERY <= count:
+            start, last = last, last + CHECKPOINT_EVERY
+            entries = self._entries(start, last)
+            root = merkle_levels([leaf for leaf, _ in entries])[-1][0]
+            new.append(json.dumps({"start": start, "index": last, "root": root, "chain": entries[-1][1]}) + "\n")
+        if new:
+            with open(self.checkpoint_file, "a", encoding="utf-8") as f:
+                f.writelines(new)
+
+    def rebuild(self, rows):
+        """Re-chains from scratch after an authorised deletion of history.
+
+        Everything in rows is trusted, so callers verify() first.
+        """
+        for path in (self.chain_file, self.checkpoint_file):
+            open(path, "wb").close()
+        if os.path.exists(self.verified_file):
+            os.remove(self.verified_file)
+        self.sync(rows, 0)
+
+    # ---------- VERIFY ----------
+    def verify(self, full=False):
+        """Checks transactions.csv against the chain; returns a list of problems.
+
+        Only rows added since the last successful verification are re-hashed,
+        unless full=True.
+        """
+        state = {"index": 0, "offset": None, "chain": GENESIS}
+        if not full and os.path.exists(self.verified_file):
+            with open(self.verified_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+
+        problems = []
+        count = len(self)
+        index, prev = state["index"], state["chain"]
+        entries = self._entries(index, count)
+
+        end = []
+        for row in self._rows_after(state, end):
+            if index >= count:
+                problems.append(f"Row {index + 1}: not in the hash chain.")
+                index += 1
+                continue
+            leaf, recorded = entries[index - state["index"]]
+            prev = chain_hash(prev, leaf)
+            if leaf_hash(row) != leaf:
+                problems.append(f"Row {index + 1}: content does not match its recorded hash.")
+            if prev != recorded:
+                problems.append(f"Row {index + 1}: chain link broken.")
+                prev = recorded
+            index += 1
+        offset = end[0]
+
+        self.rows_in_file = index
+        if index < count:
+            problems.append(f"{count - index} chained row(s) are missing from the file.")
+
+        for cp in self.checkpoints():
+            if cp["index"] <= state["index"] or cp["index"] > count:
+                continue
+            leaves = [leaf for leaf, _ in self._entries(cp["start"], cp["index"])]
+            if merkle_levels(leaves)[-1][0] != cp["root"] or self._entries(cp["index"] - 1, cp["index"])[0][1] != cp["chain"]:
+                problems.append(f"Checkpoint at row {cp['index']} does not match the chain.")
+
+        if not problems:
+            with open(self.verified_file, "w", encoding="utf-8") as f:
+                json.dump({"index": index, "offset": offset, "chain": prev}, f)
+        return problems
+
+    def _rows_after(self, state, end):
+        """Yields the rows after the verified point; appends the end byte offset to `end`."""
+        if self.serializer is not None and self.serializer.name != "csv":
+            end.append(None)
+            yield from self.serializer.load(self.transactions_file)[state["index"]:]
+            return
+        with open(self.transactions_file, "rb") as raw:
+            if state["offset"] is None:
+                raw.readline()  # header
+            else:
+                raw.seek(state["offset"])
+            text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+            for row in csv.reader(text):
+                if row:
+                    yield dict(zip(("Timestamp", "AccountNo", "Action", "Amount"), row))
+            end.append(raw.seek(0, os.SEEK_END))
+
+    # ---------- INCLUSION PROOF ----------
+    def prove(self, index):
+        """Merkle proof that row `index` (0-based) is in its checkpoint block.
+
+        Returns (leaf, proof, checkpoint); only the block's leaves are read,
+        and the proof has O(log n) entries. Rows after the last checkpoint are
+        proved against the open tail block as it stands; that checkpoint has
+        "open": True and its root changes as rows are added.
+        """
+        count = len(self)
+        if not 0 <= index < count:
+            raise ValueError(f"Row {index + 1} is not in the hash chain ({count} row(s) chained).")
+        done = self.checkpoints()
+        cp = next((c for c in done if c["start"] <= index < c["index"]), None)
+        if cp is None:
+            start = done[-1]["index"] if done else 0
+            root = merkle_levels([leaf for leaf, _ in self._entries(start, count)])[-1][0]
+            cp = {"start": start, "index": count, "root": root, "chain": self.head(), "open": True}
+        levels = merkle_levels([leaf for leaf, _ in self._entries(cp["start"], cp["index"])])
+        pos = index - cp["start"]
+        proof = []
+        for level in levels[:-1]:
+            sibling = pos ^ 1
+            if sibling >= len(level):
+                sibling = pos
+            proof.append((level[sibling], "L" if sibling < pos else "R"))
+            pos //= 2
+        return levels[0][index - cp["start"]], proof, cp
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify the transactions table against its hash chain.")
+    parser.add_argument("command", choices=["verify", "prove", "rebuild"])
+    parser.add_argument("row", nargs="?", type=int, help="row number (1-based) for 'prove'")
+    parser.add_argument("--full", action="store_true", help="re-verify every row, not only new ones")
+    parser.add_argument("--accept", action="store_true",
+                        help="rebuild even though verify reports problems (after reviewing them)")
+    serializer = configured_serializer()  # the transactions table the app writes
+    parser.add_argument("--file", default=table_path(BASE, "transactions", serializer))
+    args = parser.parse_args()
+
+    chain = HashChain(args.file, serializer)
+    if args.command == "verify":
+        problems = chain.verify(full=args.full)
+        for p in problems:
+            print(p)
+        print("Transaction history verified." if not problems else f"{len(problems)} problem(s) found.")
+    elif args.command == "rebuild":
+        # Re-chaining trusts every row in the file, so it is never done silently
+        with FileLock(args.file):
+            problems = chain.verify(full=True)
+            for p in problems:
+                print(p)
+            if problems and not args.accept:
+                print("Not rebuilt. Review the problems above and re-run with --accept to chain the file as it is.")
+                return
+            chain.rebuild(serializer.load(args.file))
+        print(f"Hash chain rebuilt over {len(chain)} row(s).")
+    else:
+        if not args.row:
+            parser.error("prove needs a row number")
+        try:
+            leaf, proof, cp = chain.prove(args.row - 1)
+        except ValueError as e:
+            print(e)
+            return
+        print(f"Leaf      : {leaf}")
+        print(f"Block     : rows {cp['start'] + 1}-{cp['index']}, root {cp['root']}"
+              + (" (open block, not checkpointed yet)" if cp.get("open") else ""))
+        for sibling, side in proof:
+            print(f"  {side} {sibling}")
+        print("Proof valid." if verify_proof(leaf, proof, cp["root"]) else "Proof INVALID.")
+
+
+if __name__ == "__main__":
+    main()
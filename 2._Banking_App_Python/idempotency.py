@@ -0,0 +1,129 @@
+import hashlib
+import math
+import sqlite3
+from datetime import datetime, timedelta
+
+
+# --------------------------------------------
+# Bloom Filter
+# --------------------------------------------
+class BloomFilter:
+    """Fixed-size Bloom filter: no false negatives, ~error_rate false positives."""
+
+    def __init__(self, capacity=100000, error_rate=0.001):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+# --------------------------------------------
+# Idempotency Key Store
+# --------------------------------------------
+class IdempotencyStore:
+    """Processed posting keys, persisted in SQLite with a Bloom filter in front.
+
+    A key is claimed with a plain INSERT, so the table's primary key decides
+    which teller process gets to post it; claims stay in an open transaction
+    until commit() (or are undone by release()/rollback()). seen() is a cheap
+    pre-check: the filter answers misses from memory and picks up keys other
+    processes committed whenever SQLite's data_version moves. Keys older than
+    `retention_days` are purged when the store is opened.
+    """
+
+    def __init__(self, path, retention_days=30):
+        self.path = path
+        self.retention = timedelta(days=retention_days)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed_keys (Key TEXT PRIMARY KEY, Timestamp TEXT NOT NULL)")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_processed_keys_ts ON processed_keys (Timestamp)")
+        self.conn.commit()
+        self.purge()
+
+    def purge(self, now=None):
+        """Drops keys past the retention window and rebuilds the Bloom filter."""
+        cutoff = ((now or datetime.now()) - self.retention).strftime("%Y-%m-%d %H:%M:%S")
+        with self.conn:
+            self.conn.execute("DELETE FROM processed_keys WHERE Timestamp < ?", (cutoff,))
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM processed_keys").fetchone()
+        self.bloom = BloomFilter(capacity=max(100000, count * 2))
+        self.last_rowid = 0
+        self.data_version = None
+        self._load_new_keys()
+
+    def _load_new_keys(self):
+        """Adds keys committed since the last look (by any process) to the filter."""
+        (version,) = self.conn.execute("PRAGMA data_version").fetchone()
+        if version == self.data_version:
+            return
+        self.data_version = version
+        # INSERT OR REPLACE and plain INSERT both hand out a new, higher rowid
+        for rowid, key in self.conn.execute(
+                "SELECT rowid, Key FROM processed_keys WHERE rowid > ?", (self.last_rowid,)):
+            self.bloom.add(key)
+            self.last_rowid = max(self.last_rowid, rowid)
+
+    def seen(self, key):
+        self._load_new_keys()
+        if key not in self.bloom:
+            return False
+        row = self.conn.execute("SELECT 1 FROM processed_keys WHERE Key = ?", (key,)).fetchone()
+        return row is not None
+
+    def claim(self, key, timestamp=None):
+        """Inserts the key; False if it was already processed. Call commit() once the posting is saved.
+
+        Callers hold the posting's file locks, so the claim and the posting
+        are atomic with respect to other teller processes.
+        """
+        ts = (timestamp or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+        opened = not self.conn.in_transaction
+        try:
+            self.conn.execute("INSERT INTO processed_keys (Key, Timestamp) VALUES (?, ?)", (key, ts))
+        except sqlite3.IntegrityError:
+            # The failed INSERT still began a write transaction; end it unless
+            # it holds earlier claims (a batch), or the database stays locked
+            if opened:
+                self.conn.rollback()
+            return False
+        self.bloom.add(key)
+        return True
+
+    def release(self, key):
+        """Undoes an uncommitted claim whose posting was rejected."""
+        self.conn.execute("DELETE FROM processed_keys WHERE Key = ?", (key,))
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        """Drops every uncommitted claim (the filter may keep them as false positives)."""
+        self.conn.rollback()
+
+    def close(self):
+        self.commit()
+        self.conn.close()
+
+
+def file_digest(path):
+    """SHA-256 of a file's content, used as the idempotency key of a batch file."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
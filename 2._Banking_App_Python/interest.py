@@ -0,0 +1,158 @@
+import argparse
+import os
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+
+from concurrency import FileLock
+from reconcile import ACTION_SIGN
+
+DAYS_IN_YEAR = 365
+BASE = os.path.dirname(os.path.abspath(__file__))
+ACCRUALS_FILE = os.path.join(BASE, "interest_accruals.csv")
+ACCRUAL_FIELDS = ["AccountNo", "AccruedThrough"]
+
+
+# --------------------------------------------
+# Average Daily Balance
+# --------------------------------------------
+def average_daily_balances(transactions, start, end, accounts=()):
+    """Average end-of-day balance of every account over [start, end] (dates, inclusive).
+
+    History is turned into one array of (account, day, signed amount) events
+    sorted by account and day. A single running prefix sum over that array
+    gives the balance after every event, and each balance is weighted by the
+    days until the account's next event, so all accounts are covered in one
+    O(n log n) pass with no per-day loop.
+    """
+    start_s, end_s = start.isoformat(), end.isoformat()
+    num_days = (end - start).days + 1
+    if num_days <= 0:
+        raise ValueError("Interest period must end on or after its start.")
+
+    opening = dict.fromkeys(accounts, 0.0)
+    day_index = {}
+    events = []
+    for t in transactions:
+        day = t["Timestamp"][:10]
+        if day > end_s:
+            continue
+        acc_no = t["AccountNo"]
+        signed = ACTION_SIGN.get(t["Action"], 0.0) * float(t["Amount"])
+        if day < start_s:
+            opening[acc_no] = opening.get(acc_no, 0.0) + signed
+            continue
+        opening.setdefault(acc_no, 0.0)
+        idx = day_index.get(day)
+        if idx is None:
+            idx = day_index[day] = (date.fromisoformat(day) - start).days
+        events.append((acc_no, idx, signed))
+
+    events.sort(key=lambda e: (e[0], e[1]))
+    running = list(accumulate(e[2] for e in events))
+
+    # Weighted balance sum per account, starting with the opening balance
+    # held until the first event of the period (or the whole period).
+    weighted = dict(opening)
+    i = 0
+    while i < len(events):
+        acc_no = events[i][0]
+        j = i
+        while j < len(events) and events[j][0] == acc_no:
+            j += 1
+        base = opening[acc_no] - (running[i - 1] if i else 0.0)
+        total = opening[acc_no] * events[i][1]
+        for k in range(i, j):
+            next_day = events[k + 1][1] if k + 1 < j else num_days
+            total += (base + running[k]) * (next_day - events[k][1])
+        weighted[acc_no] = total / num_days
+        i = j
+    return weighted
+
+
+def load_accruals(filename=ACCRUALS_FILE):
+    """{AccountNo: last day (ISO) interest has been paid for}."""
+    from banking_app import read_csv
+
+    return {r["AccountNo"]: r["AccruedThrough"] for r in read_csv(filename)}
+
+
+def accrued_interest(system, start, end, annual_rate=0.03, accruals=None):
+    """{AccountNo: (interest, first day)} for the period at annual_rate on the average daily balance.
+
+    With accruals (see load_accruals) an account only accrues from the day
+    after the last one it was paid for; accounts paid up to end are left out.
+    """
+    system.refresh("accounts")
+    system.refresh("transactions")
+    accruals = accruals or {}
+    by_start = {}
+    for a in system.accounts:
+        first = start
+        paid = accruals.get(a["AccountNo"])
+        if paid:
+            first = max(start, date.fromisoformat(paid) + timedelta(days=1))
+        if first <= end:
+            by_start.setdefault(first, []).append(a["AccountNo"])
+
+    # Usually every account shares one start, so this is a single pass
+    interest = {}
+    for first, acc_nos in by_start.items():
+        adb = average_daily_balances(system.transactions, first, end, acc_nos)
+        days = (end - first).days + 1
+        for acc_no in acc_nos:
+            amount = round(adb[acc_no] * annual_rate * days / DAYS_IN_YEAR, 2)
+            if amount > 0:
+                interest[acc_no] = (amount, first)
+    return interest
+
+
+def post_interest(system, start, end, annual_rate=0.03, filename=ACCRUALS_FILE):
+    """Credits accrued interest through the bulk posting path.
+
+    interest_accruals.csv keeps the last day each account has been paid
+    for, and accrual starts the day after it, so overlapping periods (e.g.
+    month-to-date on two days in a row) never pay a day twice. Postings are
+    keyed by account and the days actually paid, so a run that crashes
+    before the accruals are saved can simply be repeated.
+    """
+    from banking_app import write_csv
+
+    with FileLock(filename):
+        accruals = load_accruals(filename)
+        interest = accrued_interest(system, start, end, annual_rate, accruals)
+        postings = ((acc_no, acc_no, "interest", amount,
+                     f"interest:{acc_no}:{first.isoformat()}:{end.isoformat()}")
+                    for acc_no, (amount, first) in interest.items())
+        result = system.post_many(postings)
+
+        end_s = end.isoformat()
+        for a in system.accounts:
+            if accruals.get(a["AccountNo"], "") < end_s:
+                accruals[a["AccountNo"]] = end_s
+        write_csv(filename, ACCRUAL_FIELDS, ({"AccountNo": k, "AccruedThrough": v}
+                                             for k, v in sorted(accruals.items())))
+    return result
+
+
+def main():
+    from banking_app import BankingSystem
+
+    parser = argparse.ArgumentParser(description="Post average-daily-balance interest for a period.")
+    parser.add_argument("--start", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--end", required=True, help="YYYY-MM-DD (inclusive)")
+    parser.add_argument("--rate", type=float, default=0.03, help="annual rate (default 0.03)")
+    parser.add_argument("--dry-run", action="store_true", help="only print the interest per account")
+    args = parser.parse_args()
+
+    start = datetime.strptime(args.start, "%Y-%m-%d").date()
+    end = datetime.strptime(args.end, "%Y-%m-%d").date()
+    system = BankingSystem()
+    if args.dry_run:
+        for acc_no, (amount, first) in accrued_interest(system, start, end, args.rate, load_accruals()).items():
+            print(f"{acc_no} | {first.isoformat()} - {end.isoformat()} | {amount:.2f}")
+    else:
+        post_interest(system, start, end, args.rate)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+from itertools import islice
+
+
+# --------------------------------------------
+# Query Engine over the in-memory tables
+# --------------------------------------------
+# Rows are plain dicts, exactly as BankingSystem keeps them. A Query is a lazy
+# pipeline: nothing runs until it is iterated, and rows stream through
+# filters, joins and projections one at a time. Only order_by materializes.
+
+class Query:
+    def __init__(self, rows, size=None):
+        self._rows = rows
+        # Row count if known up front (lists/tables), used to pick join sides
+        self.size = size if size is not None else (len(rows) if hasattr(rows, "__len__") else None)
+
+    @classmethod
+    def table(cls, rows, alias=None):
+        """Starts a query on a table; an alias prefixes every column as 'alias.Column'."""
+        if alias is None:
+            return cls(rows, len(rows))
+        return cls(({f"{alias}.{k}": v for k, v in r.items()} for r in rows), len(rows))
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def _then(self, rows, size=None):
+        return Query(rows, size)
+
+    # ---------- FILTER / PROJECT ----------
+    def where(self, predicate):
+        return self._then(r for r in self._rows if predicate(r))
+
+    def select(self, *columns, **computed):
+        """Keeps the given columns; keyword arguments add computed ones (name=func)."""
+        def project(r):
+            out = {c.rsplit(".", 1)[-1]: r.get(c) for c in columns}
+            for name, func in computed.items():
+                out[name] = func(r)
+            return out
+        return self._then((project(r) for r in self._rows), self.size)
+
+    # ---------- ORDER / LIMIT ----------
+    def order_by(self, *keys, desc=False):
+        """Sorts by one or more columns (or key functions). Materializes the rows."""
+        def sort_key(r):
+            return tuple(k(r) if callable(k) else r.get(k) for k in keys)
+        rows = sorted(self._rows, key=sort_key, reverse=desc)
+        return self._then(rows, len(rows))
+
+    def limit(self, n):
+        size = None if self.size is None else min(n, self.size)
+        return self._then(islice(self._rows, n), size)
+
+    # ---------- JOINS ----------
+    def join(self, other, left_on, right_on, how="inner"):
+        """Hash join with `other` on left_on == right_on.
+
+        how is "inner" or "left". For inner joins the smaller side (by known
+        row count) is hashed and the larger side is streamed past it, so the
+        join costs O(left + right). Left joins always hash the right side so
+        unmatched left rows can be emitted as they stream.
+        """
+        if how not in ("inner", "left"):
+            raise ValueError("Join type must be 'inner' or 'left'.")
+        # Hash whichever side has a known, smaller row count; a streamed side
+        # of unknown size (e.g. the output of an earlier join) is never hashed
+        build_right = (how == "left" or other.size is None or self.size is None
+                       or other.size <= self.size)
+        if build_right:
+            return self._then(_hash_join(self._rows, other._rows, left_on, right_on, how == "left"))
+        return self._then(_hash_join(other._rows, self._rows, right_on, left_on, False, swap=True))
+
+    def to_list(self):
+        return list(self._rows)
+
+
+def _hash_join(probe_rows, build_rows, probe_key, build_key, keep_unmatched, swap=False):
+    table = {}
+    null_row = {}
+    for b in build_rows:
+        table.setdefault(b.get(build_key), []).append(b)
+        if keep_unmatched and not null_row:
+            null_row = dict.fromkeys(b)
+    for p in probe_rows:
+        matches = table.get(p.get(probe_key))
+        if not matches:
+            if keep_unmatched:
+                yield {**p, **null_row}
+            continue
+        for b in matches:
+            # Columns of the query's own (left) rows come first either way
+            yield {**b, **p} if swap else {**p, **b}
+
+
+# --------------------------------------------
+# Banking Reports (SQLQuery1.sql equivalents)
+# --------------------------------------------
+def account_customer_details(system):
+    """Section 13: AccountNo, Name, Email, Balance for every account."""
+    return (Query.table(system.accounts, "A")
+            .join(Query.table(system.customers, "C"), "A.CustomerID", "C.CustomerID")
+            .select("A.AccountNo", "C.Name", "C.Email", Balance=lambda r: float(r["A.Balance"])))
+
+
+def transaction_history(system):
+    """Section 14: every transaction with its customer's name, newest first."""
+    return (Query.table(system.transactions, "T")
+            .join(Query.table(system.accounts, "A"), "T.AccountNo", "A.AccountNo")
+            .join(Query.table(system.customers, "C"), "A.CustomerID", "C.CustomerID")
+            .order_by("T.Timestamp", desc=True)
+            .select("T.Timestamp", "T.AccountNo", "T.Action", "T.Amount", "C.Name"))
+
+
+def top_accounts(system, n=3):
+    """Section 15: top n accounts by balance with the customer's name."""
+    return (Query.table(system.accounts, "A")
+            .join(Query.table(system.customers, "C"), "A.CustomerID", "C.CustomerID")
+            .order_by(lambda r: float(r["A.Balance"]), desc=True)
+            .limit(n)
+            .select("A.AccountNo", "C.Name", Balance=lambda r: float(r["A.Balance"])))
+
+
+def bank_overview(system):
+    """Section 18: customers LEFT JOIN accounts LEFT JOIN transactions.
+
+    Ordered by CustomerID, then newest transaction first.
+    """
+    rows = (Query.table(system.customers, "C")
+            .join(Query.table(system.accounts, "A"), "C.CustomerID", "A.CustomerID", how="left")
+            .join(Query.table(system.transactions, "T"), "A.AccountNo", "T.AccountNo", how="left")
+            .select("C.CustomerID", "C.Name", "A.AccountNo", "A.Balance",
+                    "T.Action", "T.Amount", "T.Timestamp")
+            .to_list())
+    # Stable two-pass sort: newest first within each customer
+    rows.sort(key=lambda r: r["Timestamp"] or "", reverse=True)
+    rows.sort(key=lambda r: r["CustomerID"])
+    return Query(rows)
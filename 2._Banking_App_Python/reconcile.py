@@ -0,0 +1,160 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from banking_app import read_csv, write_csv
+from concurrency import FileLock, bump_version
+from csv_chunks import byte_ranges, read_header, read_rows
+from serializers import configured_serializer, table_path
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+
+# Sign applied to each logged Amount when replaying history
+ACTION_SIGN = {"deposit": 1.0, "withdraw": -1.0, "interest": 1.0}
+
+
+# --------------------------------------------
+# Replay (runs in worker processes)
+# --------------------------------------------
+def replay_chunk(filename, start, end, acc_col, action_col, amount_col):
+    """Sums the signed amounts per account for one byte range of transactions.csv."""
+    totals = {}
+    unknown = 0
+    for row in read_rows(filename, start, end):
+        if not row:
+            continue
+        sign = ACTION_SIGN.get(row[action_col])
+        if sign is None:
+            unknown += 1
+            continue
+        acc_no = row[acc_col]
+        totals[acc_no] = totals.get(acc_no, 0.0) + sign * float(row[amount_col])
+    return totals, unknown
+
+
+def replay_balances(transactions_file, workers=None):
+    """Replays the whole history in parallel and returns {AccountNo: balance}.
+
+    Balances are plain sums, so chunks can be replayed in any order and
+    merged afterwards.
+    """
+    header = read_header(transactions_file)
+    cols = (header.index("AccountNo"), header.index("Action"), header.index("Amount"))
+    ranges = byte_ranges(transactions_file)
+
+    balances = {}
+    unknown = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(replay_chunk, transactions_file, start, end, *cols)
+                   for start, end in ranges]
+        for future in futures:
+            totals, skipped = future.result()
+            unknown += skipped
+            for acc_no, amount in totals.items():
+                balances[acc_no] = balances.get(acc_no, 0.0) + amount
+    if unknown:
+        print(f"Warning: {unknown} transactions with an unknown action were skipped.")
+    return balances
+
+
+# --------------------------------------------
+# Reconciliation
+# --------------------------------------------
+def reconcile(accounts_file, transactions_file, workers=None, repair=False, tolerance=0.005,
+              serializer=None):
+    """Compares stored balances with replayed history.
+
+    Returns a list of (AccountNo, stored, replayed); stored is None for
+    accounts that only appear in the transaction history. CSV history is
+    replayed in parallel byte ranges; other formats (serializer) are loaded
+    and replayed in one process.
+
+    A repair holds both files' locks (in the tellers' order) from the replay
+    to the write, so a posting cannot land in between and be rolled back as
+    drift. A report-only run locks nothing while replaying.
+    """
+    if repair:
+        with FileLock(accounts_file), FileLock(transactions_file):
+            return _reconcile(accounts_file, transactions_file, workers, repair, tolerance, serializer)
+    return _reconcile(accounts_file, transactions_file, workers, repair, tolerance, serializer)
+
+
+def _reconcile(accounts_file, transactions_file, workers, repair, tolerance, serializer):
+    is_csv = serializer is None or serializer.name == "csv"
+    if is_csv:
+        replayed = replay_balances(transactions_file, workers)
+    else:
+        replayed = replay_rows(serializer.load(transactions_file))
+    with FileLock(accounts_file):
+        accounts = read_csv(accounts_file) if is_csv else serializer.load(accounts_file)
+        mismatches = compare_balances(accounts, replayed, repair, tolerance)
+        if repair and any(stored is not None for _, stored, _ in mismatches):
+            fields = ["AccountNo", "CustomerID", "Balance"]
+            if is_csv:
+                write_csv(accounts_file, fields, accounts)
+            else:
+                serializer.save(accounts_file, fields, accounts)
+            bump_version(accounts_file)
+    return mismatches
+
+
+def replay_rows(transactions):
+    """{AccountNo: balance} from in-memory transaction rows."""
+    replayed = {}
+    for t in transactions:
+        signed = ACTION_SIGN.get(t["Action"], 0.0) * float(t["Amount"])
+        replayed[t["AccountNo"]] = replayed.get(t["AccountNo"], 0.0) + signed
+    return replayed
+
+
+def reconcile_view(view, tolerance=0.005):
+    """Reconciles an in-memory point-in-time view (BankingSystem.snapshot()) without touching files."""
+    return compare_balances(view.accounts, replay_rows(view.transactions), False, tolerance)
+
+
+def compare_balances(accounts, replayed, repair=False, tolerance=0.005):
+    """Mismatches between account rows and replayed balances; repair updates the rows."""
+    mismatches = []
+    known = set()
+    for a in accounts:
+        acc_no = a["AccountNo"]
+        known.add(acc_no)
+        stored = float(a["Balance"])
+        expected = round(replayed.get(acc_no, 0.0), 2)
+        if abs(stored - expected) > tolerance:
+            mismatches.append((acc_no, stored, expected))
+            if repair:
+                a["Balance"] = expected
+    for acc_no, amount in replayed.items():
+        if acc_no not in known:
+            mismatches.append((acc_no, None, round(amount, 2)))
+    return mismatches
+
+
+def main():
+    serializer = configured_serializer()  # same tables as the app
+    parser = argparse.ArgumentParser(description="Reconcile the accounts table against the transaction history.")
+    parser.add_argument("--accounts", default=table_path(BASE, "accounts", serializer))
+    parser.add_argument("--transactions", default=table_path(BASE, "transactions", serializer))
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--repair", action="store_true", help="overwrite stored balances with replayed ones")
+    args = parser.parse_args()
+
+    mismatches = reconcile(args.accounts, args.transactions, args.workers, args.repair, serializer=serializer)
+    if not mismatches:
+        print("All balances reconcile.")
+        return
+
+    print("\n--- Mismatched Accounts ---")
+    for acc_no, stored, expected in mismatches:
+        if stored is None:
+            print(f"{acc_no} | not in accounts file | replayed {expected:.2f}")
+        else:
+            print(f"{acc_no} | stored {stored:.2f} | replayed {expected:.2f} | diff {stored - expected:+.2f}")
+    print(f"\n{len(mismatches)} mismatched account(s).")
+    if args.repair:
+        print("Stored balances repaired from transaction history.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import argparse
+import json
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from events import EventLog
+from query import account_customer_details, top_accounts
+from serializers import configured_serializer, table_path
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+
+
+# --------------------------------------------
+# Follower State
+# --------------------------------------------
+class ReplicaState:
+    """Read-only copy of the primary's tables, kept current from events.log.
+
+    Exposes customers/accounts/transactions like BankingSystem, so the
+    query.py reports run against a follower unchanged.
+    """
+
+    def __init__(self, base=BASE):
+        self.log = EventLog(os.path.join(base, "events.log"))
+        self.lock = threading.RLock()
+
+        # Events from here on may already be in the tables; applying them is
+        # idempotent for balances and de-duplicated for transaction rows.
+        # Tables are read in the primary's BANKING_FORMAT, the same data the
+        # events in events.log were written against.
+        self.applied = len(self.log)
+        serializer = configured_serializer()
+        self.customers = serializer.load(table_path(base, "customers", serializer))
+        self.accounts = serializer.load(table_path(base, "accounts", serializer))
+        self.transactions = serializer.load(table_path(base, "transactions", serializer))
+        self.account_index = {a["AccountNo"]: a for a in self.accounts}
+        self.last_event_ts = None
+        self.last_applied_at = None
+
+        bootstrap_end = self.log.refresh()
+        window = self.log.read(self.applied, bootstrap_end - self.applied)
+        stamps = [e["data"]["Timestamp"] for e in window if e["type"] == "posting"]
+        self.already_loaded = Counter(
+            _txn_key(t) for t in self.transactions if stamps and t["Timestamp"] >= min(stamps))
+        self.apply(window)
+        self.already_loaded.clear()
+
+    # ---------- APPLY ----------
+    def apply(self, events):
+        with self.lock:
+            for e in events:
+                getattr(self, "_on_" + e["type"], lambda data: None)(e["data"])
+                self.applied = e["offset"] + 1
+                self.last_event_ts = e["ts"]
+                self.last_applied_at = datetime.now()
+
+    def _on_customer_added(self, data):
+        self.customers = [c for c in self.customers if c["CustomerID"] != data["CustomerID"]]
+        self.customers.append(data)
+
+    def _on_account_created(self, data):
+        if data["AccountNo"] in self.account_index:
+            self.account_index[data["AccountNo"]].update(data)
+            return
+        self.accounts.append(data)
+        self.account_index[data["AccountNo"]] = data
+
+    def _on_posting(self, data):
+        acc = self.account_index.get(data["AccountNo"])
+        if acc is not None:
+            acc["Balance"] = data["Balance"]
+        row = {k: data[k] for k in ("Timestamp", "AccountNo", "Action", "Amount")}
+        key = _txn_key(row)
+        if self.already_loaded[key]:
+            self.already_loaded[key] -= 1
+            return
+        self.transactions.append(row)
+
+    def _on_account_removed(self, data):
+        acc_no = data["AccountNo"]
+        self.account_index.pop(acc_no, None)
+        self.accounts = [a for a in self.accounts if a["AccountNo"] != acc_no]
+        self.transactions = [t for t in self.transactions if t["AccountNo"] != acc_no]
+
+    def _on_customer_removed(self, data):
+        self.customers = [c for c in self.customers if c["CustomerID"] != data["CustomerID"]]
+
+    # ---------- TAIL ----------
+    def follow(self, interval=0.2):
+        """Applies new primary events forever (run in a background thread)."""
+        while True:
+            if self.log.refresh() > self.applied:
+                self.apply(self.log.read(self.applied, 5000))
+            else:
+                time.sleep(interval)
+
+    def lag(self):
+        """Events not yet applied, and primary-to-follower delay of the last one."""
+        behind = self.log.refresh() - self.applied
+        seconds = None
+        if self.last_event_ts:
+            produced = datetime.strptime(self.last_event_ts, "%Y-%m-%d %H:%M:%S.%f")
+            seconds = round((self.last_applied_at - produced).total_seconds(), 3)
+        return {"events_behind": behind, "applied_offset": self.applied, "last_apply_delay_s": seconds}
+
+
+def _txn_key(t):
+    return t["Timestamp"], t["AccountNo"], t["Action"], round(float(t["Amount"]), 2)
+
+
+# --------------------------------------------
+# Read-only HTTP endpoints
+# --------------------------------------------
+def make_handler(state):
+    class ReplicaHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = parse_qs(url.query)
+            with state.lock:
+                if url.path == "/customers":
+                    body = list(state.customers)
+                elif url.path == "/accounts":
+                    body = account_customer_details(state).to_list()
+                elif url.path == "/reports":
+                    body = {
+                        "total_balance": round(sum(float(a["Balance"]) for a in state.accounts), 2),
+                        "top_accounts": top_accounts(state, 3).to_list(),
+                    }
+                elif url.path == "/statement":
+                    acc_no = params.get("account", [""])[0].upper()
+                    body = [t for t in state.transactions if t["AccountNo"] == acc_no]
+                elif url.path == "/lag":
+                    body = state.lag()
+                else:
+                    self.send_error(404, "Unknown endpoint")
+                    return
+            payload = json.dumps(body, default=str).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ReplicaHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Read-only follower: tails events.log and serves listings and reports over HTTP.")
+    parser.add_argument("--port", type=int, default=8780, help="start more followers on other ports to scale reads")
+    parser.add_argument("--base", default=BASE, help="folder holding the primary's CSV files and events.log")
+    args = parser.parse_args()
+
+    state = ReplicaState(args.base)
+    threading.Thread(target=state.follow, name="replica-follow", daemon=True).start()
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(state))
+    print(f"Replica serving on http://127.0.0.1:{args.port} "
+          "(/customers /accounts /reports /statement?account=A0001 /lag)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
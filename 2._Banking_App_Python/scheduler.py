@@ -0,0 +1,189 @@
+import argparse
+import calendar
+import heapq
+import os
+from datetime import date, datetime, timedelta
+
+from concurrency import FileLock
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+ORDERS_FILE = os.path.join(BASE, "standing_orders.csv")
+ORDER_FIELDS = ["OrderID", "Kind", "AccountNo", "ToAccount", "Amount",
+                "Frequency", "StartDate", "NextRun", "EndDate", "Active"]
+
+KINDS = ("deposit", "withdraw", "transfer")
+FREQUENCIES = ("daily", "weekly", "monthly")
+
+
+# --------------------------------------------
+# Schedule Arithmetic
+# --------------------------------------------
+def advance(day, frequency, anchor_day=None):
+    """Next run date after day. Monthly orders keep their anchor day where the month has it."""
+    if frequency == "daily":
+        return day + timedelta(days=1)
+    if frequency == "weekly":
+        return day + timedelta(weeks=1)
+    if frequency == "monthly":
+        year, month = (day.year + 1, 1) if day.month == 12 else (day.year, day.month + 1)
+        wanted = anchor_day or day.day
+        return date(year, month, min(wanted, calendar.monthrange(year, month)[1]))
+    raise ValueError(f"Unknown frequency '{frequency}'.")
+
+
+# --------------------------------------------
+# Standing Orders
+# --------------------------------------------
+class StandingOrders:
+    """Standing orders stored in standing_orders.csv.
+
+    Due orders are kept in a min-heap keyed by next run date, so a run only
+    touches the orders that are due instead of scanning the whole book.
+    """
+
+    def __init__(self, filename=ORDERS_FILE):
+        from banking_app import read_csv
+
+        self.filename = filename
+        self.orders = {row["OrderID"]: row for row in read_csv(filename)}
+
+    def save(self):
+        from banking_app import write_csv
+
+        write_csv(self.filename, ORDER_FIELDS, self.orders.values())
+
+    def add(self, kind, acc_no, amount, frequency, start, to_acc="", end=""):
+        from banking_app import next_id
+
+        if kind not in KINDS:
+            raise ValueError(f"Kind must be one of {', '.join(KINDS)}.")
+        if frequency not in FREQUENCIES:
+            raise ValueError(f"Frequency must be one of {', '.join(FREQUENCIES)}.")
+        if amount <= 0:
+            raise ValueError("Amount must be positive.")
+        if (kind == "transfer") != bool(to_acc):
+            raise ValueError("A target account is required for transfers only.")
+
+        order_id = next_id(list(self.orders.values()), "OrderID", "SO", 5)
+        self.orders[order_id] = {
+            "OrderID": order_id, "Kind": kind, "AccountNo": acc_no, "ToAccount": to_acc,
+            "Amount": amount, "Frequency": frequency,
+            "StartDate": start.isoformat(), "NextRun": start.isoformat(),
+            "EndDate": end.isoformat() if end else "", "Active": "yes",
+        }
+        return order_id
+
+    def cancel(self, order_id):
+        order = self.orders.get(order_id)
+        if not order:
+            raise ValueError("Standing order not found.")
+        order["Active"] = "no"
+
+    def due(self, today):
+        """Yields (order, run_date) for every occurrence up to today, oldest first.
+
+        An order missed for several periods yields one item per period, so a
+        catch-up after downtime posts each missed payment once. NextRun and
+        Active are advanced on the order rows as items are yielded.
+        """
+        today_s = today.isoformat()
+        heap = [(o["NextRun"], order_id) for order_id, o in self.orders.items()
+                if o["Active"] == "yes" and o["NextRun"] <= today_s]
+        heapq.heapify(heap)
+
+        while heap:
+            run_s, order_id = heapq.heappop(heap)
+            order = self.orders[order_id]
+            run = date.fromisoformat(run_s)
+            if order["EndDate"] and run_s > order["EndDate"]:
+                order["Active"] = "no"
+                continue
+            yield order, run
+
+            next_s = advance(run, order["Frequency"], int(order["StartDate"][8:])).isoformat()
+            order["NextRun"] = next_s
+            if order["EndDate"] and next_s > order["EndDate"]:
+                order["Active"] = "no"
+            elif next_s <= today_s:
+                heapq.heappush(heap, (next_s, order_id))
+
+
+def run_due_orders(system, today=None, filename=ORDERS_FILE):
+    """Posts every due standing order in one batch through post_many.
+
+    Each occurrence is keyed by order and run date, so a run that crashes
+    before the schedule is saved can simply be repeated. Standing orders are
+    pre-authorised and skip the teller velocity limits.
+    """
+    today = today or date.today()
+    with FileLock(filename):
+        book = StandingOrders(filename)
+
+        def postings():
+            for order, run in book.due(today):
+                acc_no = order["AccountNo"]
+                if order["Kind"] == "transfer":
+                    acc_no = (acc_no, order["ToAccount"])
+                yield (f"Order {order['OrderID']} ({run.isoformat()})", acc_no, order["Kind"],
+                       float(order["Amount"]), f"order:{order['OrderID']}:{run.isoformat()}")
+
+        result = system.post_many(postings(), check_velocity=False)
+        book.save()
+    return result
+
+
+def main():
+    from banking_app import BankingSystem
+
+    parser = argparse.ArgumentParser(description="Manage and run standing orders.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add = sub.add_parser("add", help="create a standing order")
+    add.add_argument("--kind", choices=KINDS, required=True)
+    add.add_argument("--account", required=True, help="account to post to (source of a transfer)")
+    add.add_argument("--to", default="", help="target account of a transfer")
+    add.add_argument("--amount", type=float, required=True)
+    add.add_argument("--every", choices=FREQUENCIES, default="monthly")
+    add.add_argument("--start", required=True, help="first run, YYYY-MM-DD")
+    add.add_argument("--end", default="", help="last possible run, YYYY-MM-DD")
+
+    sub.add_parser("list", help="show all standing orders")
+
+    cancel = sub.add_parser("cancel", help="deactivate a standing order")
+    cancel.add_argument("order_id")
+
+    run = sub.add_parser("run", help="post everything due (catches up missed runs)")
+    run.add_argument("--date", help="run as of YYYY-MM-DD (default today)")
+    args = parser.parse_args()
+
+    def parse_date(value):
+        return datetime.strptime(value, "%Y-%m-%d").date() if value else None
+
+    if args.command == "run":
+        run_due_orders(BankingSystem(), parse_date(args.date))
+        return
+
+    with FileLock(ORDERS_FILE):
+        book = StandingOrders()
+        if args.command == "list":
+            for o in book.orders.values():
+                target = f" -> {o['ToAccount']}" if o["ToAccount"] else ""
+                print(f"{o['OrderID']} | {o['Kind']} {o['AccountNo']}{target} | {o['Amount']} "
+                      f"{o['Frequency']} | next {o['NextRun']} | active {o['Active']}")
+            return
+        try:
+            if args.command == "add":
+                order_id = book.add(args.kind, args.account.upper(), args.amount, args.every,
+                                    parse_date(args.start), args.to.upper(), parse_date(args.end))
+                print(f"Standing order {order_id} created.")
+            else:
+                book.cancel(args.order_id.upper())
+                print(f"Standing order {args.order_id.upper()} cancelled.")
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        book.save()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+import csv
+import json
+import os
+import struct
+from array import array
+
+# Numeric columns; every other column is text
+FLOAT_FIELDS = {"Balance", "Amount"}
+
+
+def _typed(row):
+    return {k: (float(v) if k in FLOAT_FIELDS and v not in (None, "") else v) for k, v in row.items()}
+
+
+# --------------------------------------------
+# Serializer interface
+# --------------------------------------------
+class Serializer:
+    """Loads and saves one banking table (a list of row dicts) in one file format."""
+
+    name = ""
+    extension = ""
+
+    def load(self, filename):
+        raise NotImplementedError
+
+    def save(self, filename, fieldnames, rows):
+        raise NotImplementedError
+
+    def create_if_missing(self, filename, fieldnames):
+        if not os.path.exists(filename):
+            self.save(filename, fieldnames, [])
+
+
+class CsvSerializer(Serializer):
+    """Today's format: text CSV with a header row.
+
+    Values load back as strings. On multi-core machines, files above
+    parallel_csv.PARALLEL_THRESHOLD are parsed on all cores, with the same
+    string values as the serial reader.
+    """
+
+    name = "csv"
+    extension = ".csv"
+
+    def load(self, filename):
+        if not os.path.exists(filename):
+            return []
+        from parallel_csv import PARALLEL_THRESHOLD, load_rows
+        if (os.cpu_count() or 1) > 1 and os.path.getsize(filename) >= PARALLEL_THRESHOLD:
+            return load_rows(filename)
+        with open(filename, "r", newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+
+    def save(self, filename, fieldnames, rows):
+        with open(filename, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+class JsonLinesSerializer(Serializer):
+    """One JSON object per line; numbers stay numbers."""
+
+    name = "jsonl"
+    extension = ".jsonl"
+
+    def load(self, filename):
+        if not os.path.exists(filename):
+            return []
+        with open(filename, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def save(self, filename, fieldnames, rows):
+        with open(filename, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(_typed({k: r.get(k) for k in fieldnames})) + "\n" for r in rows)
+
+
+class BinarySerializer(Serializer):
+    """Compact row format: a typed header, then per row a length-prefixed UTF-8
+    string or an 8-byte double for every field."""
+
+    name = "binary"
+    extension = ".bin"
+    MAGIC = b"BNKR"
+
+    def load(self, filename):
+        if not os.path.exists(filename):
+            return []
+        with open(filename, "rb") as f:
+            data = f.read()
+        if data[:4] != self.MAGIC:
+            raise ValueError(f"{filename} is not a binary banking table.")
+        (count,) = struct.unpack_from("<H", data, 4)
+        pos = 6
+        fields = []
+        for _ in range(count):
+            kind, length = struct.unpack_from("<cH", data, pos)
+            pos += 3
+            fields.append((data[pos:pos + length].decode("utf-8"), kind == b"d"))
+            pos += length
+        (num_rows,) = struct.unpack_from("<Q", data, pos)
+        pos += 8
+
+        unpack_len = struct.Struct("<I").unpack_from
+        unpack_float = struct.Struct("<d").unpack_from
+        rows = []
+        for _ in range(num_rows):
+            row = {}
+            for name, is_float in fields:
+                if is_float:
+                    row[name] = unpack_float(data, pos)[0]
+                    pos += 8
+                else:
+                    (length,) = unpack_len(data, pos)
+                    pos += 4
+                    row[name] = data[pos:pos + length].decode("utf-8")
+                    pos += length
+            rows.append(row)
+        return rows
+
+    def save(self, filename, fieldnames, rows):
+        out = [self.MAGIC, struct.pack("<H", len(fieldnames))]
+        for name in fieldnames:
+            encoded = name.encode("utf-8")
+            out.append(struct.pack("<cH", b"d" if name in FLOAT_FIELDS else b"s", len(encoded)) + encoded)
+        out.append(struct.pack("<Q", len(rows)))
+        pack_len = struct.Struct("<I").pack
+        pack_float = struct.Struct("<d").pack
+        for r in rows:
+            for name in fieldnames:
+                value = r.get(name)
+                if name in FLOAT_FIELDS:
+                    out.append(pack_float(float(value or 0.0)))
+                else:
+                    encoded = str(value if value is not None else "").encode("utf-8")
+                    out.append(pack_len(len(encoded)) + encoded)
+        with open(filename, "wb") as f:
+            f.write(b"".join(out))
+
+
+class ColumnarSerializer(Serializer):
+    """Arrow-style columnar layout without dependencies.
+
+    Each column is stored contiguously: float columns as raw doubles, text
+    columns as one UTF-8 data buffer plus an offsets buffer, so a column
+    loads with a single bulk copy instead of per-value parsing.
+    """
+
+    name = "columnar"
+    extension = ".col"
+    MAGIC = b"BNKC"
+
+    def load(self, filename):
+        if not os.path.exists(filename):
+            return []
+        with open(filename, "rb") as f:
+            data = f.read()
+        if data[:4] != self.MAGIC:
+            raise ValueError(f"{filename} is not a columnar banking table.")
+        header_len, = struct.unpack_from("<I", data, 4)
+        header = json.loads(data[8:8 + header_len])
+        pos = 8 + header_len
+        columns = []
+        for col in header["columns"]:
+            if col["float"]:
+                values = array("d")
+                values.frombytes(data[pos:pos + col["size"]])
+                columns.append(values.tolist())
+            else:
+                offsets = array(col["offset_type"])
+                offsets.frombytes(data[pos:pos + col["offsets"]])
+                text = data[pos + col["offsets"]:pos + col["size"]].decode("utf-8")
+                columns.append([text[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)])
+            pos += col["size"]
+        names = [col["name"] for col in header["columns"]]
+        return [dict(zip(names, values)) for values in zip(*columns)] if columns else []
+
+    def save(self, filename, fieldnames, rows):
+        meta, buffers = [], []
+        for name in fieldnames:
+            if name in FLOAT_FIELDS:
+                buf = array("d", (float(r.get(name) or 0.0) for r in rows)).tobytes()
+                meta.append({"name": name, "float": True, "size": len(buf)})
+            else:
+                values = [str(r.get(name) if r.get(name) is not None else "") for r in rows]
+                text = "".join(values)
+                offsets = array("I" if len(text) < 2 ** 32 else "Q", [0])
+                total = 0
+                for v in values:
+                    total += len(v)
+                    offsets.append(total)
+                offset_bytes = offsets.tobytes()
+                buf = offset_bytes + text.encode("utf-8")
+                meta.append({"name": name, "float": False, "offset_type": offsets.typecode,
+                             "offsets": len(offset_bytes), "size": len(buf)})
+            buffers.append(buf)
+        header = json.dumps({"columns": meta, "rows": len(rows)}).encode("utf-8")
+        with open(filename, "wb") as f:
+            f.write(self.MAGIC + struct.pack("<I", len(header)) + header)
+            for buf in buffers:
+                f.write(buf)
+
+
+class ParquetSerializer(Serializer):
+    """Apache Parquet via pyarrow (optional dependency)."""
+
+    name = "parquet"
+    extension = ".parquet"
+
+    def __init__(self):
+        import pyarrow  # noqa: F401  -- fail early with ImportError if missing
+        import pyarrow.parquet as pq
+        self.pa, self.pq = pyarrow, pq
+
+    def load(self, filename):
+        if not os.path.exists(filename):
+            return []
+        return [_typed(r) for r in self.pq.read_table(filename).to_pylist()]
+
+    def save(self, filename, fieldnames, rows):
+        columns = {}
+        for name in fieldnames:
+            if name in FLOAT_FIELDS:
+                columns[name] = self.pa.array([float(r.get(name) or 0.0) for r in rows], self.pa.float64())
+            else:
+                columns[name] = self.pa.array([str(r.get(name) or "") for r in rows], self.pa.string())
+        self.pq.write_table(self.pa.table(columns), filename)
+
+
+SERIALIZERS = {
+    "csv": CsvSerializer,
+    "jsonl": JsonLinesSerializer,
+    "binary": BinarySerializer,
+    "columnar": ColumnarSerializer,
+    "parquet": ParquetSerializer,
+}
+
+
+def get_serializer(name="csv"):
+    try:
+        return SERIALIZERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown storage format '{name}'. Choose from: {', '.join(SERIALIZERS)}.")
+
+
+def configured_serializer():
+    """The serializer BANKING_FORMAT selects; the app and every tool use the same one."""
+    return get_serializer(os.environ.get("BANKING_FORMAT", "csv"))
+
+
+def table_path(base, table, serializer):
+    """Path of a banking table ('customers', 'accounts', 'transactions') in the serializer's format."""
+    return os.path.join(base, table + serializer.extension)
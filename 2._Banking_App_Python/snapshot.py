@@ -0,0 +1,117 @@
+import csv
+import os
+import pickle
+from collections.abc import Iterable
+from datetime import datetime
+
+
+# --------------------------------------------
+# Point-in-time read views
+# --------------------------------------------
+class Snapshot:
+    """Consistent, read-only view of BankingSystem's tables.
+
+    Taking one is O(1): it keeps references to the current table lists and
+    BankingSystem copies a table before its next in-place change (see
+    BankingSystem._writable). Has customers/accounts/transactions like
+    BankingSystem, so query.py reports run against it unchanged.
+    """
+
+    def __init__(self, customers, accounts, transactions, versions):
+        self.customers = customers
+        self.accounts = accounts
+        self.transactions = transactions
+        self.versions = dict(versions)
+        self.taken_at = datetime.now()
+        self._by_customer = None
+
+    def portfolio(self, cid):
+        if self._by_customer is None:
+            self._by_customer = {}
+            for a in self.accounts:
+                self._by_customer.setdefault(a["CustomerID"], []).append(a)
+        accounts = self._by_customer.get(cid, [])
+        return accounts, sum(float(a["Balance"]) for a in accounts)
+
+    def export(self, folder):
+        """Writes the snapshot as customers/accounts/transactions CSVs into folder."""
+        os.makedirs(folder, exist_ok=True)
+        tables = {
+            "customers.csv": (self.customers, ["CustomerID", "Name", "Email", "Phone"]),
+            "accounts.csv": (self.accounts, ["AccountNo", "CustomerID", "Balance"]),
+            "transactions.csv": (self.transactions, ["Timestamp", "AccountNo", "Action", "Amount"]),
+        }
+        for filename, (rows, fieldnames) in tables.items():
+            with open(os.path.join(folder, filename), "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(rows)
+        return folder
+
+
+# --------------------------------------------
+# Fork-based snapshot (POSIX)
+# --------------------------------------------
+class ForkedReport:
+    """A report running in a forked child against the parent's memory at fork time.
+
+    The OS shares pages copy-on-write, so the fork is cheap and the parent
+    keeps posting at full speed while the child works.
+    """
+
+    def __init__(self, pid, read_fd):
+        self.pid = pid
+        self.read_fd = read_fd
+        self._result = None
+        self._done = False
+
+    def result(self):
+        """Waits for the child and returns the report's return value (or raises its error)."""
+        if not self._done:
+            with os.fdopen(self.read_fd, "rb") as f:
+                try:
+                    outcome = pickle.load(f)
+                except (EOFError, pickle.UnpicklingError):
+                    outcome = None
+            _, status = os.waitpid(self.pid, 0)
+            self._done = True
+            if outcome is None:
+                outcome = (False, f"child exited without a result (wait status {status})")
+            self._result = outcome
+        ok, value = self._result
+        if not ok:
+            raise RuntimeError(f"Forked report failed: {value}")
+        return value
+
+
+def _materialize(value):
+    """Lazy results (generators, Query objects) are read out into a list so they can be pickled."""
+    if isinstance(value, Iterable) and not isinstance(value, (str, bytes, dict, list, tuple, set, frozenset)):
+        return list(value)
+    return value
+
+
+def fork_report(system, report):
+    """Runs report(snapshot) in a forked child process; returns a ForkedReport."""
+    if not hasattr(os, "fork"):
+        raise OSError("Fork-based snapshots need a POSIX system; use system.snapshot() instead.")
+    snap = system.snapshot()
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # child
+        # Whatever happens the child must leave through os._exit, never back
+        # into the parent's code (menus, atexit handlers, open locks)
+        code = 1
+        try:
+            os.close(read_fd)
+            try:
+                data = pickle.dumps((True, _materialize(report(snap))))
+            except BaseException as e:
+                data = pickle.dumps((False, repr(e)))
+            with os.fdopen(write_fd, "wb") as f:
+                f.write(data)
+            code = 0
+        finally:
+            os._exit(code)
+    os.close(write_fd)
+    return ForkedReport(pid, read_fd)
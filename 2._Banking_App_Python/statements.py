@@ -0,0 +1,169 @@
+import argparse
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from reconcile import ACTION_SIGN
+from serializers import configured_serializer, table_path
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+
+
+# --------------------------------------------
+# One pass over history, grouped by account
+# --------------------------------------------
+def group_history(transactions_file, month, serializer=None):
+    """Returns {AccountNo: [opening balance, [period rows]]} for a YYYY-MM month.
+
+    Rows before the month only add to the opening balance; rows after it
+    are ignored. A CSV file is streamed; other formats are loaded whole.
+    """
+    start = month + "-01"
+    history = {}
+
+    def add(t):
+        ts = t["Timestamp"]
+        if ts[:7] > month:
+            return
+        entry = history.setdefault(t["AccountNo"], [0.0, []])
+        if ts < start:
+            entry[0] += ACTION_SIGN.get(t["Action"], 0.0) * float(t["Amount"])
+        else:
+            entry[1].append((ts, t["Action"], float(t["Amount"])))
+
+    if serializer is None or serializer.name == "csv":
+        with open(transactions_file, "r", newline="", encoding="utf-8") as f:
+            for t in csv.DictReader(f):
+                add(t)
+    else:
+        for t in serializer.load(transactions_file):
+            add(t)
+    for entry in history.values():
+        entry[1].sort()
+    return history
+
+
+# --------------------------------------------
+# Statement writers (run in worker processes)
+# --------------------------------------------
+def statement_paths(out_dir, cust_id):
+    return os.path.join(out_dir, f"{cust_id}.csv"), os.path.join(out_dir, f"{cust_id}.txt")
+
+
+def _replace_atomic(path, lines):
+    tmp = path + ".tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        f.writelines(lines)
+    os.replace(tmp, path)
+
+
+def write_statement(out_dir, month, customer, accounts):
+    """Writes the CSV and plain-text statement of one customer.
+
+    accounts is a list of (AccountNo, opening balance, period rows). Files
+    appear under their final names only once complete, so a half-written
+    statement is never mistaken for a finished one on resume.
+    """
+    csv_path, txt_path = statement_paths(out_dir, customer["CustomerID"])
+
+    rows = [["AccountNo", "Timestamp", "Description", "Amount", "Balance"]]
+    text = [
+        f"STATEMENT OF ACCOUNT - {month}\n",
+        f"Customer : {customer['CustomerID']} - {customer['Name']}\n",
+        f"Email    : {customer['Email']}\n",
+        f"Phone    : {customer['Phone']}\n",
+    ]
+    for acc_no, opening, period in accounts:
+        balance = opening
+        rows.append([acc_no, "", "Opening balance", "", f"{opening:.2f}"])
+        text += [
+            "\n" + "-" * 64 + "\n",
+            f"Account {acc_no}\n",
+            f"Opening Balance: {opening:.2f}\n\n",
+            f"{'Date':<20}{'Action':<12}{'Amount':>14}{'Balance':>16}\n",
+        ]
+        for ts, action, amount in period:
+            signed = ACTION_SIGN.get(action, 0.0) * amount
+            balance += signed
+            rows.append([acc_no, ts, action, f"{signed:.2f}", f"{balance:.2f}"])
+            text.append(f"{ts:<20}{action:<12}{signed:>14.2f}{balance:>16.2f}\n")
+        if not period:
+            text.append("No transactions this period.\n")
+        rows.append([acc_no, "", "Closing balance", "", f"{balance:.2f}"])
+        text.append(f"\nClosing Balance: {balance:.2f}\n")
+
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    _replace_atomic(csv_path, [buf.getvalue()])
+    _replace_atomic(txt_path, text)
+
+
+def write_statement_batch(out_dir, month, jobs):
+    for customer, accounts in jobs:
+        write_statement(out_dir, month, customer, accounts)
+    return len(jobs)
+
+
+# --------------------------------------------
+# Generator
+# --------------------------------------------
+def generate_statements(month, out_dir=None, workers=None, batch_size=500, base=BASE):
+    """Writes statements for every customer for the given YYYY-MM month.
+
+    Customers whose statement files already exist are skipped, so an
+    interrupted run picks up where it stopped.
+    """
+    out_dir = out_dir or os.path.join(base, "statements", month)
+    os.makedirs(out_dir, exist_ok=True)
+
+    serializer = configured_serializer()  # the tables in BANKING_FORMAT
+    customers = serializer.load(table_path(base, "customers", serializer))
+    accounts_by_customer = {}
+    for a in serializer.load(table_path(base, "accounts", serializer)):
+        accounts_by_customer.setdefault(a["CustomerID"], []).append(a["AccountNo"])
+    history = group_history(table_path(base, "transactions", serializer), month, serializer)
+
+    pending = []
+    for c in customers:
+        if all(os.path.exists(p) for p in statement_paths(out_dir, c["CustomerID"])):
+            continue
+        accounts = []
+        for acc_no in accounts_by_customer.get(c["CustomerID"], []):
+            opening, period = history.get(acc_no, (0.0, []))
+            accounts.append((acc_no, round(opening, 2), period))
+        pending.append((c, accounts))
+
+    skipped = len(customers) - len(pending)
+    if skipped:
+        print(f"Resuming: {skipped} statement(s) already written.")
+    if not pending:
+        print("All statements are up to date.")
+        return out_dir
+
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(write_statement_batch, out_dir, month, pending[i:i + batch_size])
+                   for i in range(0, len(pending), batch_size)]
+        for future in as_completed(futures):
+            done += future.result()
+            print(f"Statements written: {done}/{len(pending)}")
+
+    print(f"Statements saved in {out_dir}")
+    return out_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate monthly customer statements.")
+    parser.add_argument("--month", default=datetime.now().strftime("%Y-%m"), help="YYYY-MM (default: this month)")
+    parser.add_argument("--out", default=None, help="output folder (default: statements/<month>)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    datetime.strptime(args.month, "%Y-%m")
+    generate_statements(args.month, args.out, args.workers)
+
+
+if __name__ == "__main__":
+    main()
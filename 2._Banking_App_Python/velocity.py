@@ -0,0 +1,110 @@
+from collections import deque
+from datetime import datetime, timedelta
+
+
+# --------------------------------------------
+# Velocity Rules
+# --------------------------------------------
+class VelocityRule:
+    """Max count / max total of withdrawals allowed inside a sliding window.
+
+    The window is exact: every accepted withdrawal is kept with its time
+    until it falls out of the window, so a rule is evaluated in O(1)
+    amortized time no matter how many withdrawals an account has made.
+    """
+
+    def __init__(self, name, window_seconds, max_count=None, max_total=None):
+        if window_seconds <= 0:
+            raise ValueError("Window must be positive.")
+        self.name = name
+        self.window_seconds = window_seconds
+        self.max_count = max_count
+        self.max_total = max_total
+
+
+DEFAULT_WITHDRAWAL_RULES = [
+    VelocityRule("10 minutes", window_seconds=10 * 60, max_count=5, max_total=50000),
+    VelocityRule("daily", window_seconds=24 * 60 * 60, max_count=20, max_total=200000),
+]
+
+
+class _WindowCounter:
+    """Queue of (timestamp, amount) entries inside one window, with running sums."""
+
+    def __init__(self):
+        self.entries = deque()
+        self.count = 0
+        self.total = 0.0
+
+    def expire(self, cutoff):
+        """Drops entries at or before cutoff (epoch seconds)."""
+        while self.entries and self.entries[0][0] <= cutoff:
+            _, amount = self.entries.popleft()
+            self.count -= 1
+            self.total -= amount
+        if not self.entries:
+            self.total = 0.0  # no float drift left over once the window is empty
+
+    def add(self, ts, amount):
+        self.entries.append((ts, amount))
+        self.count += 1
+        self.total += amount
+
+
+# --------------------------------------------
+# Velocity Limiter
+# --------------------------------------------
+class VelocityLimiter:
+    def __init__(self, rules=None):
+        self.rules = list(DEFAULT_WITHDRAWAL_RULES if rules is None else rules)
+        self.counters = {}  # (acc_no, rule index) -> _WindowCounter
+
+    def _counter(self, acc_no, idx, rule, now):
+        ts = now.timestamp()
+        counter = self.counters.get((acc_no, idx))
+        if counter is not None:
+            counter.expire(ts - rule.window_seconds)
+        return counter, ts
+
+    def check(self, acc_no, amount, now=None):
+        """Raises ValueError if the withdrawal would break any rule. Records nothing."""
+        now = now or datetime.now()
+        for idx, rule in enumerate(self.rules):
+            counter, _ = self._counter(acc_no, idx, rule, now)
+            count = counter.count if counter else 0
+            total = counter.total if counter else 0.0
+            if rule.max_count is not None and count + 1 > rule.max_count:
+                raise ValueError(
+                    f"Velocity limit reached: max {rule.max_count} withdrawals per {rule.name}.")
+            if rule.max_total is not None and total + amount > rule.max_total:
+                raise ValueError(
+                    f"Velocity limit reached: max {rule.max_total:.2f} withdrawn per {rule.name} "
+                    f"({total:.2f} already withdrawn).")
+
+    def record(self, acc_no, amount, now=None):
+        """Adds an accepted withdrawal to every rule window of the account."""
+        now = now or datetime.now()
+        for idx, rule in enumerate(self.rules):
+            counter, ts = self._counter(acc_no, idx, rule, now)
+            if counter is None:
+                counter = self.counters[(acc_no, idx)] = _WindowCounter()
+            counter.add(ts, amount)
+
+    def load_history(self, transactions, now=None):
+        """Rebuilds the windows from logged withdrawals (one pass, newest window only).
+
+        Called whenever the ledger is reloaded, so withdrawals posted by other
+        teller processes count against the same limits.
+        """
+        self.counters = {}
+        if not self.rules:
+            return
+        now = now or datetime.now()
+        longest = max(rule.window_seconds for rule in self.rules)
+        cutoff = (now - timedelta(seconds=longest)).strftime("%Y-%m-%d %H:%M:%S")
+        recent = [t for t in transactions
+                  if t["Action"] == "withdraw" and t["Timestamp"] >= cutoff]
+        recent.sort(key=lambda t: t["Timestamp"])
+        for t in recent:
+            ts = datetime.strptime(t["Timestamp"], "%Y-%m-%d %H:%M:%S")
+            self.record(t["AccountNo"], float(t["Amount"]), ts)
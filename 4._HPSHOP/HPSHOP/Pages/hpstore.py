@@ -142,14 +142,23 @@ class HPStorePage:
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-import time
 import allure
 
+from base.wait_engine import WaitEngine
+from selinum.utils.run_profile import apply_blocking
+
 class HPStorePage:
     def __init__(self, driver, wait):
         self.driver = driver
         self.wait = wait
         self.logs = []
+        self.ready = WaitEngine(driver)
+
+    def wait_for_page(self, label):
+        """Waits for the page to go quiet and logs how long it took."""
+        with allure.step(f"Wait for {label}"):
+            seconds = self.ready.wait_until_ready(label)
+        self.logs.append(f"Waited {seconds:.2f}s for {label} ({self.ready.timings[-1][2]}).")
 
     @allure.step("Opening HP Store website")
     def open_site(self):
@@ -173,7 +182,7 @@ class HPStorePage:
         self.logs.append("Title verified!")
 
     def click_shop_now(self):
-        time.sleep(2)
+        self.wait_for_page("home page")
         try:
             shop_now = self.wait.until(
                 EC.element_to_be_clickable((By.XPATH, "//button[@class='c-button stack white-c']"))
@@ -190,7 +199,7 @@ class HPStorePage:
             search_box.send_keys(product_name)
             search_box.submit()
             self.logs.append(f"Searched for product: {product_name}")
-            time.sleep(3)  # Wait for search results to load
+            self.wait_for_page("search results")
         except Exception as e:
             self.logs.append(f"Unable to search for product. Error: {e}")
 
@@ -214,7 +223,7 @@ class HPStorePage:
         self.logs.append(f"Selected Product Name (from listing): {product_name}")
         try:
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", products[0])
-            time.sleep(1)
+            self.wait_for_page("scroll to product")
             products[0].click()
             self.logs.append("Clicked on the first product.")
         except:
@@ -225,6 +234,8 @@ class HPStorePage:
     def switch_to_product_window(self):
         windows = self.driver.window_handles
         self.driver.switch_to.window(windows[-1])
+        apply_blocking(self.driver)  # request blocking is per tab (see run_profile.py)
+        self.ready.install()  # so is the readiness tracker (see wait_engine.py)
 
     def get_product_name_detail_page(self):
         product_detail_name = self.wait.until(
@@ -237,13 +248,13 @@ class HPStorePage:
     def add_to_cart(self):
         add_to_cart_button = self.wait.until(EC.element_to_be_clickable((By.ID, "product-addtocart-button")))
         self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", add_to_cart_button)
-        time.sleep(3)
+        self.wait_for_page("add to cart button")
         add_to_cart_button.click()
         self.logs.append("Clicked 'Add to cart' button.")
         self.logs.append("Item should now be in cart.")
 
     def open_cart(self):
-        time.sleep(4)
+        self.wait_for_page("cart update")
         button = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//button[@class='action primary view-cart simple-popup-view-cart']")))
         button.click()
         self.logs.append("Opened cart view.")
@@ -0,0 +1,116 @@
+import time
+
+# Registered once per tab (install()), so Chrome runs it in every new document
+# before the page's own scripts; _state() injects it late only where that was
+# not possible. Counts in-flight fetch/XHR requests and keeps the time of the
+# last DOM mutation, so readiness can be read in a single call.
+# Only attributes that change layout or visibility count as mutations: carousels,
+# tickers and analytics tags rewrite data-*/aria-* attributes all the time and
+# would otherwise keep the page from ever looking quiet.
+_INSTALL_JS = """
+if (!window.__hpReady) {
+    var s = window.__hpReady = {requests: {}, nextId: 0, lastMutation: performance.now()};
+    var begin = function () { var id = s.nextId++; s.requests[id] = performance.now(); return id; };
+    var end = function (id) { delete s.requests[id]; };
+
+    if (window.fetch) {
+        var origFetch = window.fetch;
+        window.fetch = function () {
+            var id = begin();
+            return origFetch.apply(this, arguments).finally(function () { end(id); });
+        };
+    }
+    var origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        var id = begin();
+        this.addEventListener('loadend', function () { end(id); });
+        return origSend.apply(this, arguments);
+    };
+    new MutationObserver(function () { s.lastMutation = performance.now(); })
+        .observe(document, {childList: true, subtree: true, characterData: true,
+                            attributeFilter: ['class', 'style', 'hidden', 'disabled', 'src', 'open']});
+}
+"""
+
+# Returns [readyState, busy requests, ms since last mutation]. Requests older
+# than arguments[0] ms are treated as long-polls/beacons and not waited for.
+_STATE_JS = """
+var s = window.__hpReady, now = performance.now();
+if (!s) { return [document.readyState, -1, 0]; }
+var busy = 0;
+for (var id in s.requests) { if (now - s.requests[id] < arguments[0]) { busy++; } }
+return [document.readyState, busy, now - s.lastMutation];
+"""
+
+
+class WaitEngine:
+    """Waits until the page is quiet instead of sleeping for a fixed time.
+
+    Ready means: document.readyState is complete, no fetch/XHR started in the
+    last max_request_ms is still running, and the DOM has not changed for
+    quiet_ms. Every wait lasts at least quiet_ms, which also covers a click
+    whose navigation has not started yet. Timings are kept in self.timings.
+    Call install() again after switching to another tab.
+    """
+
+    def __init__(self, driver, timeout=15, quiet_ms=400, poll=0.1, max_request_ms=5000):
+        self.driver = driver
+        self.timeout = timeout
+        self.quiet_ms = quiet_ms
+        self.poll = poll
+        self.max_request_ms = max_request_ms
+        self.timings = []
+        self.installed = set()
+        self.install()
+
+    def install(self):
+        """Registers the tracker for every new document of the current tab (once per tab).
+
+        A script injected after load misses the requests the page started
+        before it, so it is added through CDP before the page's own scripts.
+        The current document, already loaded, falls back to _state()'s injection.
+        """
+        try:
+            handle = self.driver.current_window_handle
+            if handle in self.installed:
+                return
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _INSTALL_JS})
+            self.installed.add(handle)
+        except Exception:
+            pass  # not a Chromium driver; _state() injects per document
+
+    def _state(self):
+        try:
+            state = self.driver.execute_script(_STATE_JS, self.max_request_ms)
+            if state[1] < 0:  # document loaded before install(), or no CDP
+                self.driver.execute_script(_INSTALL_JS)
+                state = self.driver.execute_script(_STATE_JS, self.max_request_ms)
+            return state
+        except Exception:
+            return ["loading", 1, 0]  # mid-navigation; try again
+
+    def wait_until_ready(self, label="page"):
+        """Blocks until the page is quiet or timeout. Returns the seconds waited.
+
+        A timeout is recorded but not raised: the explicit element waits that
+        follow still decide whether the test can go on.
+        """
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        ready = False
+        while True:
+            ready_state, busy, quiet_for = self._state()
+            elapsed = time.perf_counter() - start
+            if (ready_state == "complete" and busy == 0 and quiet_for >= self.quiet_ms
+                    and elapsed * 1000 >= self.quiet_ms):
+                ready = True
+                break
+            if time.perf_counter() >= deadline:
+                break
+            time.sleep(self.poll)
+        elapsed = time.perf_counter() - start
+        self.timings.append((label, round(elapsed, 3), "ready" if ready else "timeout"))
+        return elapsed
+
+    def total(self):
+        return sum(t for _, t, _ in self.timings)
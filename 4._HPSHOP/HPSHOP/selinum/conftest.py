@@ -1,6 +1,11 @@
 import pytest
 from selenium import webdriver
-from selinum.utils.screenshot import take_screenshot
+from selinum.utils.browser_pool import BrowserPool
+from selinum.utils.replay_proxy import start_from_env, stop_active, use_proxy
+from selinum.utils.run_profile import apply_blocking, configure_options
+from selinum.utils.screenshot import get_service, take_screenshot
+from selinum.utils.visual import VisualChecker, visual_mode
+import base64
 import os, sys
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -8,36 +13,87 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 
+def new_chrome():
+    # HPSHOP_PROFILE=fast for headless + blocked images/fonts/trackers (see run_profile.py)
+    options = configure_options(webdriver.ChromeOptions())
+    # HPSHOP_REPLAY=record/replay routes the browser through the local stand-in (see replay_proxy.py)
+    use_proxy(options)
+    return apply_blocking(webdriver.Chrome(options=options))
+
+
+@pytest.fixture(scope="session")
+def browser_pool(request):
+    # HPSHOP_POOL_SIZE warm browsers, each recycled after HPSHOP_POOL_MAX_USES tests
+    pool = BrowserPool(new_chrome,
+                       size=int(os.environ.get("HPSHOP_POOL_SIZE", "1")),
+                       max_uses=int(os.environ.get("HPSHOP_POOL_MAX_USES", "20")),
+                       prepare=apply_blocking)
+    start_from_env()
+    # Even if warm-up fails the browsers are quit and the proxy stopped
+    # (which saves a recording's archive)
+    try:
+        pool.warm_up()
+        yield pool
+    finally:
+        pool.close()
+        proxy_report = stop_active()
+    reporter = request.config.pluginmanager.get_plugin("terminalreporter")
+    if reporter:
+        reporter.write_line(pool.report())
+        if proxy_report:
+            reporter.write_line(proxy_report)
+
+
 @pytest.fixture(scope="function")
-def driver():
-    options = webdriver.ChromeOptions()
-    options.add_argument("--start-maximized")
-    # options.add_argument("--headless=new")  # enable for CI
-    drv = webdriver.Chrome(options=options)
+def driver(browser_pool):
+    drv = browser_pool.acquire()
     yield drv
-    try:
-        drv.quit()
-    except Exception:
-        pass
+    browser_pool.release(drv)
 
 @pytest.fixture(scope="function")
 def ss(request, driver):
+    # Screenshots go through the background service; HPSHOP_SCREENSHOTS sets the policy
+    service = get_service()
+    # HPSHOP_VISUAL=1 compares every step with its baseline (see utils/visual.py)
+    mode = visual_mode()
+
     class SSHelper:
         def __init__(self):
             self.test_name = request.node.nodeid
             self.seq = 0
             self.driver = driver
+            self.visual = VisualChecker(self.test_name, mode) if mode else None
         def take(self, step: str):
             self.seq += 1
-            return take_screenshot(self.driver, self.test_name, step, self.seq)
+            if self.visual is None:
+                return service.capture(self.driver, self.test_name, step, self.seq)
+            b64 = self.driver.get_screenshot_as_base64()
+            self.visual.check(base64.b64decode(b64), step, self.driver)
+            return service.capture(self.driver, self.test_name, step, self.seq, b64=b64)
+        def final(self, failed: bool):
+            if failed or service.policy == "all":
+                service.capture(self.driver, self.test_name, "final_state", 999, final=True)
     helper = SSHelper()
     yield helper
+    rep = getattr(request.node, "rep_call", None)
+    service.finish(helper.test_name, failed=bool(rep and rep.failed))
 
+@pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
-    if call.when == "call":
-        driver_fixture = item.funcargs.get("driver") if "driver" in item.funcargs else None
-        if driver_fixture:
-            try:
+    outcome = yield
+    rep = outcome.get_result()
+    setattr(item, "rep_" + rep.when, rep)
+    if rep.when == "call":
+        helper = item.funcargs.get("ss")
+        driver_fixture = item.funcargs.get("driver")
+        # A visual regression fails an otherwise passing test, with every diff listed
+        if helper and helper.visual and helper.visual.failures() and rep.passed:
+            rep.outcome = "failed"
+            rep.longrepr = helper.visual.summary()
+        try:
+            if helper:
+                helper.final(rep.failed)
+            elif driver_fixture and rep.failed:
                 take_screenshot(driver_fixture, item.nodeid, "final_state", seq=999)
-            except Exception:
-                pass
\ No newline at end of file
+        except Exception:
+            pass
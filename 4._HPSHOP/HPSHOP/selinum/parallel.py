@@ -0,0 +1,135 @@
+# selinum/parallel.py
+# Parallel runner for the HP store product matrix.
+#
+#   python -m selinum.parallel -n 4                      # whole testcase/ folder
+#   python -m selinum.parallel -n 4 testcase/test_hpstore.py -k Pavilion
+#
+# Every worker is a separate pytest process with its own browser. Each one
+# collects the same tests and keeps every N-th case (this module is loaded as
+# a pytest plugin via -p selinum.parallel), writes screenshots to
+# screenshots/worker-<i>/ and Allure results to allure-results/worker-<i>/.
+# When all workers finish, the Allure files are merged into allure-results/;
+# the previous run's results are cleared first, but history/ is kept for trends.
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+ALLURE_DIR = BASE_DIR / "allure-results"
+SCREENSHOT_DIR = BASE_DIR / "screenshots"
+# Kept between runs: Allure's trend history and the report's config files
+ALLURE_KEEP = {"history", "environment.properties", "categories.json", "executor.json"}
+
+# "<index>/<count>" for the current worker, set by the runner
+SHARD_ENV = "HPSHOP_SHARD"
+
+
+# --------------------------------------------
+# pytest plugin: keep only this worker's shard
+# --------------------------------------------
+def pytest_collection_modifyitems(config, items):
+    shard = os.environ.get(SHARD_ENV)
+    if not shard:
+        return
+    index, count = (int(x) for x in shard.split("/"))
+    # Collection order is deterministic, so every worker sees the same list
+    # and round-robin keeps neighbouring products on different workers.
+    keep = [item for i, item in enumerate(items) if i % count == index]
+    drop = [item for i, item in enumerate(items) if i % count != index]
+    if drop:
+        config.hook.pytest_deselected(items=drop)
+    items[:] = keep
+
+
+# --------------------------------------------
+# Runner
+# --------------------------------------------
+def merge_allure_results(shard_dirs, target=ALLURE_DIR):
+    """Moves every worker's result files into one folder Allure can report on.
+
+    Result and attachment files are named by UUID, so they never collide;
+    shared files (environment.properties, categories.json) keep the first copy.
+    """
+    target.mkdir(parents=True, exist_ok=True)
+    moved = 0
+    for shard_dir in shard_dirs:
+        if not shard_dir.exists():
+            continue
+        for f in shard_dir.iterdir():
+            dest = target / f.name
+            if not dest.exists():
+                shutil.move(str(f), str(dest))
+                moved += 1
+        shutil.rmtree(shard_dir, ignore_errors=True)
+    return moved
+
+
+def clear_previous_results(folder=ALLURE_DIR):
+    """Removes the last run's result files, keeping history/ and config files (ALLURE_KEEP)."""
+    if not folder.exists():
+        return
+    for f in folder.iterdir():
+        if f.name in ALLURE_KEEP:
+            continue
+        if f.is_dir():
+            shutil.rmtree(f, ignore_errors=True)
+        else:
+            f.unlink()
+
+
+def run_shards(workers, pytest_args):
+    """Starts one pytest process per shard and waits for all of them.
+
+    Returns the worst exit code, so the run fails if any shard failed.
+    """
+    clear_previous_results()
+
+    procs, shard_dirs = [], []
+    for index in range(workers):
+        shard_dir = ALLURE_DIR / f"worker-{index}"
+        shard_dirs.append(shard_dir)
+        env = dict(os.environ)
+        env[SHARD_ENV] = f"{index}/{workers}"
+        env["HPSHOP_SCREENSHOT_DIR"] = str(SCREENSHOT_DIR / f"worker-{index}")
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BASE_DIR), env.get("PYTHONPATH")]))
+        cmd = [sys.executable, "-m", "pytest", "-p", "selinum.parallel",
+               f"--alluredir={shard_dir}", *pytest_args]
+        log = open(BASE_DIR / f"worker-{index}.log", "w", encoding="utf-8")
+        procs.append((index, subprocess.Popen(cmd, cwd=BASE_DIR, env=env,
+                                              stdout=log, stderr=subprocess.STDOUT), log))
+
+    exit_code = 0
+    for index, proc, log in procs:
+        code = proc.wait()
+        log.close()
+        print(f"worker-{index}: exit code {code} (log: worker-{index}.log)")
+        # 5 = no tests collected, e.g. more workers than products
+        if code not in (0, 5):
+            exit_code = max(exit_code, code)
+
+    moved = merge_allure_results(shard_dirs)
+    print(f"Merged {moved} Allure files into {ALLURE_DIR}")
+    return exit_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the HP store tests in parallel shards.")
+    parser.add_argument("-n", "--workers", type=int, default=os.cpu_count() or 2,
+                        help="number of worker processes, one browser each")
+    args, pytest_args = parser.parse_known_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    start = time.time()
+    code = run_shards(args.workers, pytest_args or ["testcase"])
+    print(f"Finished in {time.time() - start:.1f}s with {args.workers} workers.")
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+
+class BrowserPool:
+    """Session-wide pool of warm browsers that tests check out and return.
+
+    factory() must return a new WebDriver. Browsers are reset between tests
+    (fresh tab, cookies and every visited site's storage cleared) and recycled after max_uses
+    checkouts, or as soon as a reset or health check fails. prepare(driver),
+    if given, runs on every fresh tab, i.e. after each reset.
+    """
+
+    def __init__(self, factory, size=1, max_uses=20, prepare=None):
+        self.factory = factory
+        self.prepare = prepare
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.idle = []
+        self.uses = {}
+        self.stats = {"hits": 0, "misses": 0, "recycled": 0, "crashed": 0, "reset_seconds": 0.0}
+
+    def warm_up(self):
+        """Launches the pool's browsers in parallel before the first test."""
+        with ThreadPoolExecutor(max_workers=self.size) as ex:
+            for drv in ex.map(lambda _: self.factory(), range(self.size - len(self.idle))):
+                self.uses[id(drv)] = 0
+                self.idle.append(drv)
+
+    def acquire(self):
+        while self.idle:
+            drv = self.idle.pop()
+            if self._alive(drv):
+                self.stats["hits"] += 1
+                self.uses[id(drv)] += 1
+                return drv
+            self.stats["crashed"] += 1
+            self._quit(drv)
+        self.stats["misses"] += 1
+        drv = self.factory()
+        self.uses[id(drv)] = 1
+        return drv
+
+    def release(self, drv):
+        """Resets the browser and puts it back, or quits it if it is worn out or broken."""
+        if self.uses.get(id(drv), 0) >= self.max_uses:
+            self.stats["recycled"] += 1
+            self._quit(drv)
+            return
+        start = time.perf_counter()
+        try:
+            self.reset(drv)
+            if self.prepare:
+                self.prepare(drv)
+        except Exception:
+            self.stats["crashed"] += 1
+            self._quit(drv)
+            return
+        finally:
+            self.stats["reset_seconds"] += time.perf_counter() - start
+        if len(self.idle) < self.size:
+            self.idle.append(drv)
+        else:
+            self._quit(drv)
+
+    @staticmethod
+    def reset(drv):
+        """Leaves the browser as a fresh one would be: one blank tab, no cookies or storage for any site."""
+        old_handles = drv.window_handles
+        origins = set()
+        for handle in old_handles:
+            drv.switch_to.window(handle)
+            origins |= BrowserPool._visited_origins(drv)
+        try:
+            # Cookies and cache go for every site at once; localStorage,
+            # IndexedDB, service workers etc. per origin the tabs have visited
+            drv.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            drv.execute_cdp_cmd("Network.clearBrowserCache", {})
+            for origin in origins:
+                drv.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        except Exception:
+            drv.delete_all_cookies()
+            try:
+                drv.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except Exception:
+                pass  # about:blank and error pages have no storage
+
+        # A new tab has no back/forward history or sessionStorage; close everything else
+        drv.switch_to.new_window("tab")
+        fresh = drv.current_window_handle
+        for handle in old_handles:
+            drv.switch_to.window(handle)
+            drv.close()
+        drv.switch_to.window(fresh)
+
+    @staticmethod
+    def _visited_origins(drv):
+        """http(s) origins in the current tab's back/forward history and its frames."""
+        urls = []
+        try:
+            urls += [e["url"] for e in drv.execute_cdp_cmd("Page.getNavigationHistory", {})["entries"]]
+            frames = [drv.execute_cdp_cmd("Page.getFrameTree", {})["frameTree"]]
+            while frames:
+                node = frames.pop()
+                urls.append(node["frame"]["url"])
+                frames += node.get("childFrames", [])
+        except Exception:
+            pass
+        origins = set()
+        for url in urls:
+            parts = urlsplit(url)
+            if parts.scheme in ("http", "https") and parts.netloc:
+                origins.add(f"{parts.scheme}://{parts.netloc}")
+        return origins
+
+    def close(self):
+        while self.idle:
+            self._quit(self.idle.pop())
+
+    def report(self):
+        checkouts = self.stats["hits"] + self.stats["misses"]
+        rate = self.stats["hits"] / checkouts * 100 if checkouts else 0.0
+        return (f"Browser pool: {checkouts} checkouts, {self.stats['hits']} warm hits ({rate:.0f}%), "
+                f"{self.stats['misses']} cold starts, {self.stats['recycled']} recycled, "
+                f"{self.stats['crashed']} crashed, {self.stats['reset_seconds']:.1f}s resetting")
+
+    @staticmethod
+    def _alive(drv):
+        try:
+            drv.window_handles
+            return True
+        except Exception:
+            return False
+
+    def _quit(self, drv):
+        self.uses.pop(id(drv), None)
+        try:
+            drv.quit()
+        except Exception:
+            pass
@@ -0,0 +1,119 @@
+# Test data from Excel, parsed once and cached on disk.
+#
+# Workbooks are read with openpyxl in read_only mode (rows are streamed from the
+# XML, not loaded into a full object model). The parsed rows are pickled into
+# .cache/testdata/, so later collections (and every parallel worker) load a
+# small pickle instead of re-parsing the workbook. A cache entry is found by
+# path + mtime + size; if those changed it is found again by content hash, so
+# a checkout that only touches mtime does not re-parse.
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+
+import openpyxl
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+CACHE_DIR = Path(os.environ.get("HPSHOP_DATA_CACHE") or BASE_DIR / ".cache" / "testdata")
+
+# Bump when the cached layout changes so old pickles are ignored
+CACHE_VERSION = 1
+
+
+def _clean(value):
+    return value.strip() if isinstance(value, str) else value
+
+
+def _parse(file_path, sheet_name):
+    """All non-empty rows of the sheet as tuples of typed cell values."""
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = wb[sheet_name]
+        rows = []
+        for row in sheet.iter_rows(values_only=True):
+            row = tuple(_clean(v) for v in row)
+            if any(v is not None and v != "" for v in row):
+                rows.append(row)
+        return rows
+    finally:
+        wb.close()
+
+
+def _content_hash(file_path):
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _load_pickle(path):
+    try:
+        with open(path, "rb") as f:
+            version, rows = pickle.load(f)
+        return rows if version == CACHE_VERSION else None
+    except Exception:
+        return None
+
+
+def _save_pickle(path, rows):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")  # parallel workers may race here
+    with open(tmp, "wb") as f:
+        pickle.dump((CACHE_VERSION, rows), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def read_table(file_path, sheet_name="Sheet1"):
+    """Every non-empty row of the sheet as a tuple, using the disk cache."""
+    file_path = Path(file_path).resolve()
+    st = file_path.stat()
+    stamp = hashlib.sha256(f"{file_path}|{st.st_mtime_ns}|{st.st_size}|{sheet_name}".encode()).hexdigest()
+    stamp_path = CACHE_DIR / f"stamp-{stamp[:32]}.pkl"
+    rows = _load_pickle(stamp_path)
+    if rows is not None:
+        return rows
+
+    content_path = CACHE_DIR / f"content-{_content_hash(file_path)[:32]}-{sheet_name}.pkl"
+    rows = _load_pickle(content_path)
+    if rows is None:
+        rows = _parse(file_path, sheet_name)
+        _save_pickle(content_path, rows)
+    _save_pickle(stamp_path, rows)
+    return rows
+
+
+def read_rows(file_path, sheet_name="Sheet1", columns=None):
+    """Rows as dicts keyed by the header row, with cell types kept (int, float, datetime...).
+
+    columns limits (and orders) the keys returned.
+    """
+    table = read_table(file_path, sheet_name)
+    if not table:
+        return []
+    header = [str(h) if h is not None else f"col{i + 1}" for i, h in enumerate(table[0])]
+    rows = [dict(zip(header, row)) for row in table[1:]]
+    if columns:
+        missing = [c for c in columns if c not in header]
+        if missing:
+            raise KeyError(f"Columns not in {Path(file_path).name}: {', '.join(missing)}")
+        rows = [{c: r.get(c) for c in columns} for r in rows]
+    return rows
+
+
+def read_params(file_path, columns, sheet_name="Sheet1"):
+    """Tuples of the given columns per row, ready for pytest.mark.parametrize."""
+    return [tuple(r[c] for c in columns) for r in read_rows(file_path, sheet_name, columns)]
+
+
+def read_column(file_path, sheet_name="Sheet1", col=1, header=False):
+    """One column as a list of strings (1-based col), skipping empty cells."""
+    table = read_table(file_path, sheet_name)
+    vals = []
+    for row in table[1:] if header else table:
+        v = row[col - 1] if col <= len(row) else None
+        if v is None:
+            continue
+        vals.append(str(v).strip())
+    return vals
@@ -1,4 +1,4 @@
-from selenium.common.exceptions import NoAlertPresentException
+from selenium.common.exceptions import NoAlertPresentException, UnexpectedAlertPresentException
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -36,42 +36,84 @@ def remove_element_by_js(driver, css_selector):
     except Exception:
         return False
 
+CLOSE_SELECTORS = [
+    (By.CSS_SELECTOR, ".modal-close"),
+    (By.CSS_SELECTOR, ".close-btn"),
+    (By.CSS_SELECTOR, ".cookie-consent__close"),
+    (By.CSS_SELECTOR, ".popup-close"),
+    (By.XPATH, "//button[contains(text(),'No thanks')]"),
+    (By.XPATH, "//button[contains(@aria-label,'close')]"),
+]
+OVERLAY_SELECTOR = ".popup, .modal, .overlay"
+MAX_FRAMES = 5
+
+# One round-trip probe: tries every selector in the page, then in up to
+# MAX_FRAMES same-origin iframes (cross-origin ones throw and are skipped),
+# and clicks the first visible match. The selector remembered for this host
+# goes first. Without a match it sends Escape and removes the first overlay,
+# as remove_element_by_js(driver, OVERLAY_SELECTOR) always did.
+# Returns [how, selector index, frame index, host].
+_PROBE_JS = """
+var selectors = arguments[0], overlay = arguments[1], maxFrames = arguments[2];
+var host = location.host, order = [], remembered = arguments[3][host];
+if (remembered !== undefined) { order.push(remembered); }
+for (var k = 0; k < selectors.length; k++) { if (k !== remembered) { order.push(k); } }
+function visible(el) {
+    return !!(el && (el.offsetWidth || el.offsetHeight || el.getClientRects().length));
+}
+function find(doc, sel) {
+    if (sel[0] === 'xpath') {
+        var res = doc.evaluate(sel[1], doc, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (var i = 0; i < res.snapshotLength; i++) { if (visible(res.snapshotItem(i))) { return res.snapshotItem(i); } }
+        return null;
+    }
+    var els = doc.querySelectorAll(sel[1]);
+    for (var j = 0; j < els.length; j++) { if (visible(els[j])) { return els[j]; } }
+    return null;
+}
+var docs = [document], frames = document.querySelectorAll('iframe');
+for (var f = 0; f < frames.length && f < maxFrames; f++) {
+    try { if (frames[f].contentDocument) { docs.push(frames[f].contentDocument); } else { docs.push(null); } }
+    catch (e) { docs.push(null); }
+}
+for (var d = 0; d < docs.length; d++) {
+    if (!docs[d]) { continue; }
+    for (var o = 0; o < order.length; o++) {
+        var el = find(docs[d], selectors[order[o]]);
+        if (el) { el.click(); return ['button', order[o], d - 1, host]; }
+    }
+}
+document.dispatchEvent(new KeyboardEvent('keydown', {key: 'Escape', keyCode: 27, bubbles: true}));
+var first = document.querySelector(overlay);
+if (first) { first.parentNode.removeChild(first); }
+return [first ? 'removed' : 'none', -1, -1, host];
+"""
+
+# Host -> index into CLOSE_SELECTORS that closed a popup there last time
+_remembered = {}
+_PROBE_SELECTORS = [["xpath" if by == By.XPATH else "css", sel] for by, sel in CLOSE_SELECTORS]
+
+
 def dismiss_known_popups(driver):
-    if try_accept_alert(driver):
-        return "alert_accepted"
-    close_selectors = [
-        (By.CSS_SELECTOR, ".modal-close"),
-        (By.CSS_SELECTOR, ".close-btn"),
-        (By.CSS_SELECTOR, ".cookie-consent__close"),
-        (By.CSS_SELECTOR, ".popup-close"),
-        (By.XPATH, "//button[contains(text(),'No thanks')]"),
-        (By.XPATH, "//button[contains(@aria-label,'close')]"),
-    ]
-    if close_modal_by_close_button(driver, close_selectors):
-        return "button_closed"
-    try:
-        iframes = driver.find_elements(By.TAG_NAME, "iframe")
-        for idx, fr in enumerate(iframes[:5]):
-            try:
-                driver.switch_to.frame(fr)
-                if close_modal_by_close_button(driver, close_selectors):
-                    driver.switch_to.default_content()
-                    return f"iframe_closed_idx_{idx}"
-            except Exception:
-                pass
-            finally:
-                try:
-                    driver.switch_to.default_content()
-                except Exception:
-                    pass
-    except Exception:
-        pass
+    """Closes whatever popup is showing with one probe script, or accepts an alert.
+
+    Alerts are only looked for when the probe reports one, so the usual
+    no-alert case costs a single round trip. configure_options sets
+    unhandledPromptBehavior to "ignore", so the alert is still open to be
+    accepted. The selector that worked on a domain is remembered and tried
+    first on the next call for that domain.
+    """
     try:
-        press_escape(driver)
+        how, sel_idx, frame_idx, host = driver.execute_script(
+            _PROBE_JS, _PROBE_SELECTORS, OVERLAY_SELECTOR, MAX_FRAMES, _remembered)
+    except UnexpectedAlertPresentException:
+        return "alert_accepted" if try_accept_alert(driver) else "not_handled"
     except Exception:
-        pass
-    try:
-        remove_element_by_js(driver, ".popup, .modal, .overlay")
+        return "not_handled"
+
+    if how == "button":
+        _remembered[host] = sel_idx
+        return "button_closed" if frame_idx < 0 else f"iframe_closed_idx_{frame_idx}"
+    if how == "removed":
         return "js_removed"
-    except Exception:
-        return "not_handled"
\ No newline at end of file
+    return "not_handled"
@@ -0,0 +1,258 @@
+# Record/replay stand-in for the HP store, picked per run with:
+#
+#   HPSHOP_REPLAY=record    browse the live site through a local proxy and save every response
+#   HPSHOP_REPLAY=replay    serve those responses locally; nothing leaves the machine
+#   HPSHOP_REPLAY_ARCHIVE=path   archive file (default selinum/resources/hpstore_archive.jsonl.gz)
+#
+# Chrome is pointed at the proxy with --proxy-server, so page objects keep using
+# the real https://store.hp.com URLs. HTTPS is terminated with a local
+# self-signed certificate (made once with the openssl CLI) that Chrome accepts
+# because of --ignore-certificate-errors. Record with one worker; replay can
+# run under selinum/parallel.py.
+
+import base64
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import ssl
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_ARCHIVE = BASE_DIR / "selinum" / "resources" / "hpstore_archive.jsonl.gz"
+CERT_DIR = BASE_DIR / ".cache" / "replay"
+
+# Not forwarded in either direction
+HOP_HEADERS = {"connection", "keep-alive", "proxy-connection", "proxy-authorization",
+               "te", "trailer", "transfer-encoding", "upgrade"}
+# Dropped from relayed responses: we set the length, and Chrome must not try QUIC
+RESPONSE_DROP = HOP_HEADERS | {"content-length", "alt-svc"}
+
+
+def ensure_cert(folder=CERT_DIR):
+    """Self-signed certificate for the proxy's TLS side; created on first use."""
+    folder = Path(folder)
+    cert, key = folder / "cert.pem", folder / "key.pem"
+    if not (cert.exists() and key.exists()):
+        folder.mkdir(parents=True, exist_ok=True)
+        try:
+            subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+                            "-keyout", str(key), "-out", str(cert), "-days", "3650",
+                            "-subj", "/CN=hpshop-replay"],
+                           check=True, capture_output=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise RuntimeError("Could not create the replay certificate; is openssl on PATH?") from e
+    return str(cert), str(key)
+
+
+def request_key(method, url, body=b""):
+    """Archive key: method + URL, plus a body hash for requests that send one."""
+    key = f"{method} {url}"
+    if body:
+        key += " #" + hashlib.sha1(body).hexdigest()[:16]
+    return key
+
+
+def loose_key(method, url):
+    """Fallback key without query string, for cache busters and timestamps."""
+    parts = urlsplit(url)
+    return f"{method} {parts.scheme}://{parts.netloc}{parts.path}"
+
+
+class Archive:
+    """Recorded responses in a gzipped JSON-lines file, one response per line."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        self.loose = {}
+        self.lock = threading.Lock()
+
+    def load(self):
+        if not self.path.exists():
+            raise FileNotFoundError(f"No replay archive at {self.path}. Run once with HPSHOP_REPLAY=record.")
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                self._index(entry)
+        return self
+
+    def _index(self, entry):
+        self.entries[entry["key"]] = entry
+        # first response for a path wins, it is the one the flow saw first
+        self.loose.setdefault(loose_key(entry["method"], entry["url"]), entry)
+
+    def add(self, method, url, body, status, headers, payload):
+        entry = {"key": request_key(method, url, body), "method": method, "url": url,
+                 "status": status, "headers": headers,
+                 "body": base64.b64encode(payload).decode("ascii")}
+        with self.lock:
+            self._index(entry)
+
+    def find(self, method, url, body=b""):
+        return self.entries.get(request_key(method, url, body)) or self.loose.get(loose_key(method, url))
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp, self.path)
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    tunnel_host = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_CONNECT(self):
+        # Answer the tunnel, then speak TLS to the browser and read the real requests
+        host, _, port = self.path.partition(":")
+        self.tunnel_host = host if port in ("", "443") else self.path
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+        try:
+            self.connection = self.server.tls.wrap_socket(self.connection, server_side=True)
+        except (ssl.SSLError, OSError):
+            self.close_connection = True
+            return
+        self.rfile = self.connection.makefile("rb", self.rbufsize)
+        self.wfile = self.connection.makefile("wb", self.wbufsize)
+        self.close_connection = False
+        while not self.close_connection:
+            self.handle_one_request()
+
+    def _url(self):
+        if self.tunnel_host:
+            return f"https://{self.tunnel_host}{self.path}"
+        return self.path  # plain-HTTP proxy requests carry the absolute URL
+
+    def _relay(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        url = self._url()
+        if self.server.mode == "record":
+            status, headers, payload = self._fetch(url, body)
+            self.server.archive.add(self.command, url, body, status, headers, payload)
+        else:
+            entry = self.server.archive.find(self.command, url, body)
+            if entry is None:
+                self.server.misses += 1
+                status, headers, payload = 404, [["Content-Type", "text/plain"]], b"not recorded"
+            else:
+                self.server.hits += 1
+                status, headers, payload = entry["status"], entry["headers"], base64.b64decode(entry["body"])
+
+        self.send_response(status)
+        for name, value in headers:
+            if name.lower() not in RESPONSE_DROP:
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    def _fetch(self, url, body):
+        parts = urlsplit(url)
+        conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        conn = conn_cls(parts.netloc, timeout=30)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        headers = {k: v for k, v in self.headers.items() if k.lower() not in HOP_HEADERS}
+        try:
+            conn.request(self.command, path, body=body or None, headers=headers)
+            resp = conn.getresponse()
+            payload = resp.read()  # chunked bodies come back whole; encoding is kept
+            return resp.status, [[k, v] for k, v in resp.getheaders()
+                                 if k.lower() not in HOP_HEADERS], payload
+        except OSError as e:
+            return 502, [["Content-Type", "text/plain"]], f"upstream error: {e}".encode()
+        finally:
+            conn.close()
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = do_OPTIONS = do_PATCH = _relay
+
+
+class ReplayProxy:
+    """Local proxy that records to, or replays from, an Archive."""
+
+    def __init__(self, mode, archive_path=DEFAULT_ARCHIVE, port=0):
+        if mode not in ("record", "replay"):
+            raise ValueError("Replay mode must be 'record' or 'replay'.")
+        self.mode = mode
+        self.archive = Archive(archive_path)
+        if mode == "replay":
+            self.archive.load()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), _ProxyHandler)
+        self.server.daemon_threads = True
+        self.server.mode = mode
+        self.server.archive = self.archive
+        self.server.hits = self.server.misses = 0
+        cert, key = ensure_cert()
+        self.server.tls = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.server.tls.load_cert_chain(cert, key)
+        self.thread = None
+
+    @property
+    def port(self):
+        return self.server.server_address[1]
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="replay-proxy", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.mode == "record":
+            self.archive.save()
+
+    def chrome_arguments(self):
+        return [f"--proxy-server=127.0.0.1:{self.port}",
+                "--proxy-bypass-list=<-loopback>",
+                "--ignore-certificate-errors"]
+
+    def report(self):
+        if self.mode == "record":
+            return f"Replay proxy: recorded {len(self.archive.entries)} responses to {self.archive.path}"
+        return f"Replay proxy: {self.server.hits} served from archive, {self.server.misses} not recorded"
+
+
+_active = None
+
+
+def start_from_env():
+    """Starts the proxy if HPSHOP_REPLAY asks for one; returns it or None."""
+    global _active
+    mode = os.environ.get("HPSHOP_REPLAY", "").strip().lower()
+    if not mode or _active is not None:
+        return _active
+    _active = ReplayProxy(mode, os.environ.get("HPSHOP_REPLAY_ARCHIVE") or DEFAULT_ARCHIVE).start()
+    return _active
+
+
+def stop_active():
+    global _active
+    if _active is not None:
+        _active.stop()
+        report, _active = _active.report(), None
+        return report
+    return None
+
+
+def use_proxy(options):
+    """Adds the running proxy's switches to ChromeOptions (no-op without one)."""
+    if _active is not None:
+        for arg in _active.chrome_arguments():
+            options.add_argument(arg)
+    return options
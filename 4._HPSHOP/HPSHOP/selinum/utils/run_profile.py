@@ -0,0 +1,98 @@
+# Run profiles for the Chrome driver, picked per run with environment variables:
+#
+#   HPSHOP_PROFILE=fast           headless Chrome + network blocking
+#   HPSHOP_BLOCK_TYPES=image,font resource types to block (default: image,font,media)
+#   HPSHOP_BLOCK_URLS=*a.com*,... extra URL patterns to block (on top of the trackers)
+#
+# Blocking uses the DevTools Network.setBlockedURLs command, so blocked files
+# never leave the browser while the page's HTML, CSS and scripts still load
+# and the elements HPStorePage waits for are untouched. That command only
+# covers one tab, so tracker hosts and images are also blocked browser-wide
+# with Chrome switches; those cover tabs the site opens itself (the product
+# page) from their first request.
+
+import os
+
+# Resource types map to URL patterns, which is what setBlockedURLs understands
+RESOURCE_PATTERNS = {
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.ico*", "*.svg*"],
+    "font": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*", "*.ogg*"],
+}
+
+# Analytics and ad hosts the store pulls in; none of them render anything we test
+TRACKER_HOSTS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "facebook.net",
+    "hotjar.com", "clarity.ms", "bat.bing.com", "demdex.net", "omtrdc.net",
+    "qualtrics.com", "criteo.com", "taboola.com",
+]
+TRACKER_PATTERNS = [f"*{host}*" for host in TRACKER_HOSTS] + ["*facebook.com/tr*"]
+
+DEFAULT_BLOCK_TYPES = "image,font,media"
+
+
+def _split(value):
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def current_profile():
+    return os.environ.get("HPSHOP_PROFILE", "default").strip().lower()
+
+
+def blocked_types():
+    kinds = _split(os.environ.get("HPSHOP_BLOCK_TYPES", DEFAULT_BLOCK_TYPES))
+    for kind in kinds:
+        if kind not in RESOURCE_PATTERNS:
+            raise ValueError(f"Unknown resource type '{kind}'. Use: {', '.join(RESOURCE_PATTERNS)}")
+    return kinds
+
+
+def blocked_patterns():
+    """URL patterns to block for this run, or [] outside the fast profile."""
+    if current_profile() != "fast":
+        return []
+    patterns = list(TRACKER_PATTERNS)
+    for kind in blocked_types():
+        patterns += RESOURCE_PATTERNS[kind]
+    patterns += _split(os.environ.get("HPSHOP_BLOCK_URLS", ""))
+    return patterns
+
+
+def configure_options(options):
+    """Adds the profile's Chrome switches to a ChromeOptions object."""
+    # Leave alerts open instead of dismissing them with the error, so
+    # dismiss_known_popups can accept them (see popup.py)
+    options.set_capability("unhandledPromptBehavior", "ignore")
+    if current_profile() == "fast":
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")  # --start-maximized is a no-op headless
+        options.add_argument("--disable-extensions")
+        # get() returns at DOMContentLoaded; page objects wait for what they need
+        options.page_load_strategy = "eager"
+        # Browser-wide, so every tab is covered (not resolved behind the replay proxy)
+        rules = ", ".join(f"MAP {h} ~NOTFOUND, MAP *.{h} ~NOTFOUND" for h in TRACKER_HOSTS)
+        options.add_argument(f"--host-resolver-rules={rules}")
+        if "image" in blocked_types():
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    else:
+        options.add_argument("--start-maximized")
+    return options
+
+
+def apply_blocking(driver):
+    """Turns on request blocking for the driver's current tab.
+
+    The block list belongs to the tab, so call this again after switching to
+    a new one (the browser pool does it after every reset, and HPStorePage
+    when it switches to the product window). Trackers and images are already
+    blocked browser-wide by configure_options.
+    """
+    patterns = blocked_patterns()
+    if not patterns:
+        return driver
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except Exception:
+        pass  # not a Chromium driver; run unblocked
+    return driver
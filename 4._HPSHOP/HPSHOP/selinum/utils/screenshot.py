@@ -1,9 +1,16 @@
+import atexit
+import base64
+import hashlib
+import os
+import queue
+import threading
 import time
 from pathlib import Path
 import allure
 
 BASE_DIR = Path(__file__).resolve().parents[2]
-SCREENSHOT_ROOT = BASE_DIR / "screenshots"
+# parallel workers (selinum/parallel.py) each get their own folder
+SCREENSHOT_ROOT = Path(os.environ.get("HPSHOP_SCREENSHOT_DIR") or BASE_DIR / "screenshots")
 
 def ensure_dir(path: Path):
     path.mkdir(parents=True, exist_ok=True)
@@ -33,4 +40,127 @@ def take_screenshot(driver, test_name: str, step: str, seq: int = None, attach_a
                 allure.attach(f.read(), name=filename, attachment_type=allure.attachment_type.PNG)
         except Exception:
             pass
-    return str(filepath)
\ No newline at end of file
+    return str(filepath)
+
+
+# --------------------------------------------
+# Screenshot service
+# --------------------------------------------
+# HPSHOP_SCREENSHOTS picks the capture policy for a run:
+#   all          every step (default)
+#   on-failure   steps are held in memory and only written if the test fails
+#   sample:N     every N-th step, plus the final frame of a failed test
+def parse_policy(value):
+    value = (value or "all").strip().lower()
+    if value in ("all", "on-failure"):
+        return value, 1
+    if value.startswith("sample:") and value[7:].isdigit() and int(value[7:]) > 0:
+        return "sample", int(value[7:])
+    raise ValueError(f"Unknown screenshot policy '{value}'. Use all, on-failure or sample:N.")
+
+
+class ScreenshotService:
+    """Takes screenshots without making the test wait for the disk.
+
+    capture() grabs the browser's base64 PNG once, decodes it and queues the
+    bytes; a background thread writes them. A frame identical to the test's
+    previous one is dropped. finish() runs at test teardown: it attaches the
+    kept bytes to Allure on the main thread, because allure-pytest tracks the
+    running test per thread, and leaves the disk writes to finish on their own.
+    """
+
+    def __init__(self, policy=None, root=None):
+        self.policy, self.sample_every = parse_policy(policy or os.environ.get("HPSHOP_SCREENSHOTS"))
+        self.root = Path(root) if root else SCREENSHOT_ROOT
+        self.queue = queue.Queue()
+        self.folders = {}
+        self.last_digest = {}
+        self.held = {}
+        self.written = {}
+        self.stats = {"captured": 0, "duplicates": 0, "skipped": 0, "written": 0}
+        self.worker = threading.Thread(target=self._write_loop, name="screenshot-writer", daemon=True)
+        self.worker.start()
+
+    def capture(self, driver, test_name: str, step: str, seq: int, final: bool = False, b64: str = None):
+        """Returns the path the frame will be written to, or None if it was not kept.
+
+        b64 is a frame the caller already grabbed, so it is not taken twice.
+        """
+        if not final and self.policy == "sample" and (seq - 1) % self.sample_every:
+            self.stats["skipped"] += 1
+            return None
+        try:
+            b64 = b64 or driver.get_screenshot_as_base64()
+        except Exception:
+            return None
+        digest = hashlib.blake2b(b64.encode("ascii"), digest_size=16).digest()
+        if self.last_digest.get(test_name) == digest:
+            self.stats["duplicates"] += 1
+            return None
+        self.last_digest[test_name] = digest
+        self.stats["captured"] += 1
+
+        folder = self.folders.get(test_name)
+        if folder is None:
+            safe_test = test_name.replace("/", "_").replace("::", "_")
+            folder = self.folders[test_name] = self.root / f"{safe_test}_{get_timestamp()}"
+        path = folder / f"{get_timestamp()}_{seq:02d}_{step}.png"
+
+        if self.policy == "on-failure" and not final:
+            self.held.setdefault(test_name, []).append((path, b64))
+        else:
+            self._submit(test_name, path, b64)
+        return str(path)
+
+    def finish(self, test_name: str, failed: bool, attach_allure: bool = True):
+        """Flushes a finished test: held frames if it failed, then Allure attachments.
+
+        Returns the frames' paths; their files may still be in the write queue.
+        """
+        held = self.held.pop(test_name, [])
+        if failed:
+            for path, b64 in held:
+                self._submit(test_name, path, b64)
+        frames = self.written.pop(test_name, [])
+        if attach_allure:
+            for path, png in frames:
+                try:
+                    allure.attach(png, name=path.name, attachment_type=allure.attachment_type.PNG)
+                except Exception:
+                    pass
+        self.folders.pop(test_name, None)
+        self.last_digest.pop(test_name, None)
+        return [str(path) for path, _ in frames]
+
+    def close(self):
+        self.queue.join()
+
+    def _submit(self, test_name, path, b64):
+        png = base64.b64decode(b64)
+        self.written.setdefault(test_name, []).append((path, png))
+        self.queue.put((path, png))
+
+    def _write_loop(self):
+        while True:
+            path, png = self.queue.get()
+            try:
+                ensure_dir(path.parent)
+                with open(path, "wb") as f:
+                    f.write(png)
+                self.stats["written"] += 1
+            except Exception:
+                pass
+            finally:
+                self.queue.task_done()
+
+
+_service = None
+
+
+def get_service() -> ScreenshotService:
+    """The process-wide screenshot service, started on first use."""
+    global _service
+    if _service is None:
+        _service = ScreenshotService()
+        atexit.register(_service.close)
+    return _service
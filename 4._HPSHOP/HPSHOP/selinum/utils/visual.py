@@ -0,0 +1,211 @@
+# Visual regression checks for ss.take() steps.
+#
+#   HPSHOP_VISUAL=1        compare every step with its baseline (missing ones are saved as new baselines)
+#   HPSHOP_VISUAL=update   overwrite the baselines with this run's frames
+#   HPSHOP_VISUAL_TOLERANCE=0.001   share of pixels allowed to differ
+#
+# Baselines live in selinum/baselines/<test>/<step>.png. selinum/baselines/masks.json
+# lists regions to ignore per step (fnmatch pattern), either CSS selectors or
+# [x, y, width, height] boxes, e.g. {"*": [".price-box", "#promo-banner"]}.
+
+import fnmatch
+import io
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import allure
+import numpy as np
+from PIL import Image
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+BASELINE_DIR = BASE_DIR / "selinum" / "baselines"
+
+PIXEL_THRESHOLD = 16   # per-channel difference below this is rendering noise
+REGION_SIZE = 64       # grid cell size for the region summary
+
+# Viewport boxes of the matched elements, in screenshot pixels
+_RECTS_JS = """
+var out = [], dpr = window.devicePixelRatio || 1;
+arguments[0].forEach(function (sel) {
+    document.querySelectorAll(sel).forEach(function (el) {
+        var r = el.getBoundingClientRect();
+        if (r.width && r.height) { out.push([r.left * dpr, r.top * dpr, r.width * dpr, r.height * dpr]); }
+    });
+});
+return out;
+"""
+
+
+@dataclass
+class VisualResult:
+    step: str
+    diff_ratio: float
+    passed: bool
+    seconds: float
+    regions: list = field(default_factory=list)
+    diff_png: bytes = None
+    message: str = ""
+
+
+def decode_png(png: bytes) -> np.ndarray:
+    return np.asarray(Image.open(io.BytesIO(png)).convert("RGB"))
+
+
+def encode_png(pixels: np.ndarray) -> bytes:
+    buf = io.BytesIO()
+    Image.fromarray(pixels).save(buf, format="PNG", compress_level=1)
+    return buf.getvalue()
+
+
+def build_mask(shape, boxes) -> np.ndarray:
+    """Boolean (height, width) array that is True inside the ignored boxes."""
+    mask = np.zeros(shape[:2], dtype=bool)
+    for x, y, w, h in boxes:
+        x0, y0 = max(int(x), 0), max(int(y), 0)
+        mask[y0:int(y + h + 0.5), x0:int(x + w + 0.5)] = True
+    return mask
+
+
+def diff_pixels(baseline: np.ndarray, actual: np.ndarray, mask=None, threshold=PIXEL_THRESHOLD):
+    """Boolean array of pixels where any channel differs by more than threshold.
+
+    max - min on uint8 gives the absolute difference without widening the
+    arrays, and OR-ing the channel planes is much faster than .max(axis=2);
+    a 1080p comparison takes around 10ms.
+    """
+    delta = np.maximum(baseline, actual)
+    delta -= np.minimum(baseline, actual)
+    over = delta > threshold
+    changed = over[..., 0] | over[..., 1] | over[..., 2]
+    if mask is not None:
+        changed &= ~mask
+    return changed
+
+
+def changed_regions(changed: np.ndarray, size=REGION_SIZE, limit=5):
+    """The grid cells with the most changed pixels, as (x, y, w, h, changed share)."""
+    h, w = changed.shape
+    ph, pw = -h % size, -w % size
+    padded = np.pad(changed, ((0, ph), (0, pw)))
+    cells = padded.reshape(padded.shape[0] // size, size, padded.shape[1] // size, size).sum(axis=(1, 3))
+    order = np.argsort(cells, axis=None)[::-1][:limit]
+    regions = []
+    for flat in order:
+        row, col = divmod(int(flat), cells.shape[1])
+        if cells[row, col] == 0:
+            break
+        regions.append((col * size, row * size, size, size, round(float(cells[row, col]) / size ** 2, 3)))
+    return regions
+
+
+def render_diff(actual: np.ndarray, changed: np.ndarray, mask=None) -> np.ndarray:
+    """Dimmed frame with changed pixels in red and ignored regions in blue."""
+    out = (actual // 3).astype(np.uint8)
+    if mask is not None:
+        out[mask] = (out[mask] // 2) + np.array([0, 0, 120], dtype=np.uint8)
+    out[changed] = (255, 0, 0)
+    return out
+
+
+class VisualChecker:
+    """Compares a test's frames with stored baselines, one per step."""
+
+    def __init__(self, test_name: str, mode="check", tolerance=None, baseline_dir=BASELINE_DIR):
+        self.mode = mode
+        self.tolerance = float(tolerance if tolerance is not None
+                               else os.environ.get("HPSHOP_VISUAL_TOLERANCE", "0.001"))
+        self.baseline_dir = Path(baseline_dir)
+        self.folder = self.baseline_dir / test_name.replace("/", "_").replace("::", "_")
+        self.masks = self._load_masks()
+        self.results = []
+
+    def _load_masks(self):
+        path = self.baseline_dir / "masks.json"
+        if not path.exists():
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def mask_boxes(self, step, driver=None):
+        selectors, boxes = [], []
+        for pattern, entries in self.masks.items():
+            if fnmatch.fnmatch(step, pattern):
+                for entry in entries:
+                    (selectors if isinstance(entry, str) else boxes).append(entry)
+        if selectors and driver is not None:
+            try:
+                boxes += driver.execute_script(_RECTS_JS, selectors)
+            except Exception:
+                pass
+        return boxes
+
+    def check(self, png: bytes, step: str, driver=None) -> VisualResult:
+        start = time.perf_counter()
+        baseline_path = self.folder / f"{step}.png"
+        if self.mode == "update" or not baseline_path.exists():
+            self.folder.mkdir(parents=True, exist_ok=True)
+            with open(baseline_path, "wb") as f:
+                f.write(png)
+            result = VisualResult(step, 0.0, True, time.perf_counter() - start, message="baseline saved")
+            self.results.append(result)
+            return result
+
+        baseline_png = baseline_path.read_bytes()
+        if baseline_png == png:
+            result = VisualResult(step, 0.0, True, time.perf_counter() - start)
+            self.results.append(result)
+            return result
+
+        actual = decode_png(png)
+        baseline = decode_png(baseline_png)
+        if baseline.shape != actual.shape:
+            result = VisualResult(step, 1.0, False, time.perf_counter() - start,
+                                  diff_png=png, message=f"size {actual.shape[1]}x{actual.shape[0]} "
+                                                        f"!= baseline {baseline.shape[1]}x{baseline.shape[0]}")
+        else:
+            boxes = self.mask_boxes(step, driver)
+            mask = build_mask(actual.shape, boxes) if boxes else None
+            changed = diff_pixels(baseline, actual, mask)
+            compared = changed.size - (int(mask.sum()) if mask is not None else 0)
+            ratio = float(changed.sum()) / max(compared, 1)
+            passed = ratio <= self.tolerance
+            result = VisualResult(step, round(ratio, 5), passed, time.perf_counter() - start)
+            if not passed:
+                result.regions = changed_regions(changed)
+                result.diff_png = encode_png(render_diff(actual, changed, mask))
+                result.message = f"{ratio:.2%} of pixels changed (tolerance {self.tolerance:.2%})"
+
+        if not result.passed:
+            try:
+                allure.attach(result.diff_png, name=f"visual_diff_{step}",
+                              attachment_type=allure.attachment_type.PNG)
+                allure.attach(baseline_png, name=f"visual_baseline_{step}",
+                              attachment_type=allure.attachment_type.PNG)
+            except Exception:
+                pass
+        self.results.append(result)
+        return result
+
+    def failures(self):
+        return [r for r in self.results if not r.passed]
+
+    def summary(self):
+        lines = []
+        for r in self.failures():
+            regions = ", ".join(f"({x},{y} {w}x{h}: {share:.0%})" for x, y, w, h, share in r.regions)
+            lines.append(f"visual regression at step '{r.step}': {r.message}"
+                         + (f"; top regions {regions}" if regions else ""))
+        return "\n".join(lines)
+
+
+def visual_mode():
+    """'check', 'update' or None, from HPSHOP_VISUAL."""
+    value = os.environ.get("HPSHOP_VISUAL", "").strip().lower()
+    if value in ("1", "true", "check"):
+        return "check"
+    if value == "update":
+        return "update"
+    return None
@@ -11,8 +11,8 @@ if PROJECT_ROOT not in sys.path:
 
 # Try to reuse fixtures from selinum.conftest if available
 try:
-    from selinum.conftest import driver, ss  # noqa: F401
-    # If import succeeds, pytest will discover those fixtures from this module.
+    from selinum.conftest import browser_pool, driver, ss, pytest_runtest_makereport  # noqa: F401
+    # If import succeeds, pytest will discover those fixtures (and the report hook) from this module.
 except Exception:
     # Fallback fixtures (webdriver-manager + simple screenshot helper)
     import pytest
@@ -23,21 +23,44 @@ except Exception:
     except Exception:
         ChromeDriverManager = None
 
-    @pytest.fixture(scope="function")
-    def driver():
-        options = webdriver.ChromeOptions()
-        options.add_argument("--start-maximized")
-        # options.add_argument("--headless=new")  # enable if desired
+    from selinum.utils.browser_pool import BrowserPool
+    from selinum.utils.replay_proxy import start_from_env, stop_active, use_proxy
+    from selinum.utils.run_profile import apply_blocking, configure_options
+
+    def new_chrome():
+        options = configure_options(webdriver.ChromeOptions())  # HPSHOP_PROFILE=fast for headless
+        use_proxy(options)  # HPSHOP_REPLAY=record/replay
         if ChromeDriverManager is not None:
             service = ChromeService(ChromeDriverManager().install())
-            drv = webdriver.Chrome(service=service, options=options)
-        else:
-            drv = webdriver.Chrome(options=options)  # requires chromedriver on PATH
-        yield drv
+            return apply_blocking(webdriver.Chrome(service=service, options=options))
+        return apply_blocking(webdriver.Chrome(options=options))  # requires chromedriver on PATH
+
+    @pytest.fixture(scope="session")
+    def browser_pool(request):
+        pool = BrowserPool(new_chrome,
+                           size=int(os.environ.get("HPSHOP_POOL_SIZE", "1")),
+                           max_uses=int(os.environ.get("HPSHOP_POOL_MAX_USES", "20")),
+                           prepare=apply_blocking)
+        start_from_env()
+        # Even if warm-up fails the browsers are quit and the proxy stopped
+        # (which saves a recording's archive)
         try:
-            drv.quit()
-        except Exception:
-            pass
+            pool.warm_up()
+            yield pool
+        finally:
+            pool.close()
+            proxy_report = stop_active()
+        reporter = request.config.pluginmanager.get_plugin("terminalreporter")
+        if reporter:
+            reporter.write_line(pool.report())
+            if proxy_report:
+                reporter.write_line(proxy_report)
+
+    @pytest.fixture(scope="function")
+    def driver(browser_pool):
+        drv = browser_pool.acquire()
+        yield drv
+        browser_pool.release(drv)
 
     @pytest.fixture(scope="function")
     def ss(request, driver):
@@ -51,7 +74,7 @@ except Exception:
                 self.test_name = request.node.nodeid.replace("/", "_").replace("::", "_")
                 self.seq = 0
                 self.driver = driver
-                self.root = Path(PROJECT_ROOT) / "screenshots"
+                self.root = Path(os.environ.get("HPSHOP_SCREENSHOT_DIR") or Path(PROJECT_ROOT) / "screenshots")
             def _ensure(self):
                 self.root.mkdir(parents=True, exist_ok=True)
             def take(self, step: str):
@@ -23,28 +23,8 @@ if HPStorePage is None:
         "Could not import HPStorePage. Tried:\n" f"{msgs}\n\nEnsure hpstore.py defines `HPStorePage`."
     )
 
-# Import excel reader
-try:
-    from selinum.utils.excel_reader import read_column
-except Exception:
-    # fallback minimal excel reader if needed (requires openpyxl)
-    try:
-        import openpyxl
-
-        def read_column(file_path, sheet_name="Sheet1", col=1, header=False):
-            wb = openpyxl.load_workbook(file_path, data_only=True)
-            sheet = wb[sheet_name]
-            start = 2 if header else 1
-            vals = []
-            for row in sheet.iter_rows(min_row=start, values_only=True):
-                v = row[col - 1]
-                if v is None:
-                    continue
-                vals.append(str(v).strip())
-            return vals
-
-    except Exception as e:
-        raise ImportError("Couldn't import selinum.utils.excel_reader and openpyxl fallback failed.") from e
+# Test data: streamed from Excel once, then served from the on-disk cache
+from selinum.utils.data_provider import read_column
 
 # Find products.xlsx
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))